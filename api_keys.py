@@ -7,16 +7,22 @@ Easy setup wizard for finding, registering, and managing API keys
 import os
 import sys
 import json
-import keyring
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
-import webbrowser
+from types import MappingProxyType
+from typing import Dict, Iterable, List, Optional, Tuple
 
 CONFIG_DIR = Path.home() / ".gh-ai-assistant"
 KEYRING_SERVICE = "gh-ai-assistant"
+KEY_CACHE_TTL = 300  # seconds a keyring lookup stays fresh
+# Which providers have keys (never the keys themselves), so startup can skip
+# polling the keyring for every provider
+CONFIGURED_MANIFEST = CONFIG_DIR / "configured.json"
 
-# Provider information with links and instructions
-PROVIDERS = {
+# Provider information with links and instructions (read-only at runtime)
+PROVIDERS = MappingProxyType({
     "openrouter": {
         "name": "OpenRouter",
         "description": "Access to 100+ models including all major providers",
@@ -187,51 +193,128 @@ PROVIDERS = {
             "Up-to-date information"
         ]
     }
+})
+
+# Menu order used when the user picks a provider by number
+_PROVIDER_IDS = tuple(PROVIDERS)
+
+MIN_KEY_LENGTH = 10
+
+# Expected key prefix per provider, derived once from the "key_format" hints.
+# Formats with no prefix (e.g. "...") are left out so only the length is checked.
+_KEY_PREFIXES = {
+    provider_id: info["key_format"][:-3]
+    for provider_id, info in PROVIDERS.items()
+    if info.get("key_format", "").endswith("...") and info["key_format"] != "..."
 }
 
 
+def invalidate_configured_manifest():
+    """Forget the configured-providers manifest so the next listing rescans the keyring"""
+    CONFIGURED_MANIFEST.unlink(missing_ok=True)
+
+
+@lru_cache(maxsize=1)
+def _ensure_config_dir():
+    """Create the config directory once per process"""
+    CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+
+
 class APIKeyManager:
     """Manages API keys for multiple providers"""
     
     def __init__(self):
         self.keyring_service = KEYRING_SERVICE
-        CONFIG_DIR.mkdir(parents=True, exist_ok=True)
+        _ensure_config_dir()
+        # provider -> (key, monotonic time of lookup); keyring calls are slow IPC
+        self._key_cache: Dict[str, Tuple[Optional[str], float]] = {}
         
     def save_key(self, provider: str, api_key: str):
         """Save API key securely to keyring"""
+        import keyring  # deferred: backend discovery is slow at import time
+        
         keyring.set_password(self.keyring_service, f"{provider}_api_key", api_key)
+        self._key_cache[provider] = (api_key, time.monotonic())
+        self._update_manifest(provider, True)
         print(f"✅ {provider.title()} API key saved securely")
         
     def get_key(self, provider: str) -> Optional[str]:
-        """Retrieve API key from keyring"""
-        return keyring.get_password(self.keyring_service, f"{provider}_api_key")
+        """Retrieve API key from keyring (cached for KEY_CACHE_TTL seconds)"""
+        cached = self._key_cache.get(provider)
+        if cached is not None and time.monotonic() - cached[1] < KEY_CACHE_TTL:
+            return cached[0]
+            
+        import keyring
+        
+        key = keyring.get_password(self.keyring_service, f"{provider}_api_key")
+        self._key_cache[provider] = (key, time.monotonic())
+        return key
         
     def delete_key(self, provider: str):
         """Delete API key from keyring"""
+        import keyring
+        
         try:
             keyring.delete_password(self.keyring_service, f"{provider}_api_key")
             print(f"✅ {provider.title()} API key deleted")
         except:
             print(f"⚠️  No key found for {provider}")
+        self._key_cache.pop(provider, None)
+        self._update_manifest(provider, False)
+        
+    def get_keys_bulk(self, providers: Iterable[str]) -> Dict[str, Optional[str]]:
+        """Retrieve several keys concurrently (keyring lookups are IPC-bound)"""
+        providers = list(providers)
+        with ThreadPoolExecutor(max_workers=max(1, min(8, len(providers)))) as executor:
+            return dict(zip(providers, executor.map(self.get_key, providers)))
             
     def list_configured_providers(self) -> List[str]:
         """List providers with configured keys"""
-        configured = []
-        for provider in PROVIDERS.keys():
-            if self.get_key(provider):
-                configured.append(provider)
+        configured = self._read_manifest()
+        if configured is not None:
+            return [provider for provider in PROVIDERS if provider in configured]
+            
+        keys = self.get_keys_bulk(PROVIDERS)
+        configured = [provider for provider, key in keys.items() if key]
+        self._write_manifest(configured)
         return configured
         
+    def _read_manifest(self) -> Optional[List[str]]:
+        """Read the configured-providers manifest, None if missing or unreadable"""
+        try:
+            return json.loads(CONFIGURED_MANIFEST.read_bytes())
+        except (OSError, ValueError):
+            return None
+            
+    def _write_manifest(self, providers: List[str]):
+        """Atomically replace the configured-providers manifest"""
+        try:
+            tmp_file = CONFIGURED_MANIFEST.with_suffix('.tmp')
+            tmp_file.write_text(json.dumps(sorted(providers)))
+            tmp_file.replace(CONFIGURED_MANIFEST)
+        except OSError:
+            pass  # The manifest is only a shortcut; the keyring stays authoritative
+            
+    def _update_manifest(self, provider: str, configured: bool):
+        """Add or remove one provider in the manifest, if one has been written"""
+        providers = self._read_manifest()
+        if providers is None:
+            return  # Next list_configured_providers() rebuilds it from the keyring
+        providers = set(providers)
+        if configured:
+            providers.add(provider)
+        else:
+            providers.discard(provider)
+        self._write_manifest(list(providers))
+        
     def validate_key_format(self, provider: str, key: str) -> bool:
         """Basic validation of key format"""
-        expected = PROVIDERS[provider].get("key_format", "")
-        
-        if not key or len(key) < 10:
+        if not key or len(key) < MIN_KEY_LENGTH:
             return False
             
         # Check prefix if specified
-        if expected and expected.endswith("..."):
-            prefix = expected.replace("...", "")
+        prefix = _KEY_PREFIXES.get(provider)
+        if prefix is not None:
             if not key.startswith(prefix):
                 print(f"⚠️  Warning: Key should start with '{prefix}'")
                 return True  # Warning only, still accept
@@ -239,6 +322,12 @@ class APIKeyManager:
         return True
 
 
+@lru_cache(maxsize=1)
+def get_api_key_manager() -> APIKeyManager:
+    """Shared APIKeyManager so its key cache survives across menu actions"""
+    return APIKeyManager()
+
+
 def print_header(text: str):
     """Print formatted header"""
     width = 70
@@ -247,32 +336,49 @@ def print_header(text: str):
     print("=" * width + "\n")
 
 
+def _render_provider_info(provider: Dict) -> str:
+    """Build the detailed information block for a provider"""
+    lines = [
+        f"\n📋 {provider['name']}",
+        "-" * 70,
+        f"Description: {provider['description']}",
+        f"Free Tier: {provider['free_tier']}",
+        f"Key Format: {provider['key_format']}",
+        "",
+        "✨ Benefits:",
+    ]
+    lines.extend(f"   • {benefit}" for benefit in provider['benefits'])
+    lines.append("")
+    lines.append("📝 Setup Instructions:")
+    lines.extend(f"   {instruction}" for instruction in provider['instructions'])
+    lines.extend([
+        "",
+        f"🔗 Sign up: {provider['signup_url']}",
+        f"📚 Docs: {provider['docs_url']}",
+        "-" * 70,
+    ])
+    return "\n".join(lines)
+
+
+# Provider data is static, so the display strings are rendered once at import
+_PROVIDER_INFO_BLOCKS = {
+    provider_id: _render_provider_info(info) for provider_id, info in PROVIDERS.items()
+}
+_PROVIDER_MENU_LINES = {
+    provider_id: f"{info['name']} - {info['description']}"
+    for provider_id, info in PROVIDERS.items()
+}
+
+
 def print_provider_info(provider_id: str):
     """Display detailed provider information"""
-    provider = PROVIDERS[provider_id]
-    
-    print(f"\n📋 {provider['name']}")
-    print("-" * 70)
-    print(f"Description: {provider['description']}")
-    print(f"Free Tier: {provider['free_tier']}")
-    print(f"Key Format: {provider['key_format']}")
-    print()
-    print("✨ Benefits:")
-    for benefit in provider['benefits']:
-        print(f"   • {benefit}")
-    print()
-    print("📝 Setup Instructions:")
-    for instruction in provider['instructions']:
-        print(f"   {instruction}")
-    print()
-    print(f"🔗 Sign up: {provider['signup_url']}")
-    print(f"📚 Docs: {provider['docs_url']}")
-    print("-" * 70)
+    sys.stdout.write(_PROVIDER_INFO_BLOCKS[provider_id] + "\n")
+    sys.stdout.flush()
 
 
 def interactive_setup():
     """Interactive API key setup wizard"""
-    manager = APIKeyManager()
+    manager = get_api_key_manager()
     
     print_header("🔑 API KEY SETUP WIZARD")
     print("Welcome! This wizard will help you set up API keys for AI providers.")
@@ -283,7 +389,8 @@ def interactive_setup():
     if configured:
         print(f"✅ You have {len(configured)} provider(s) configured:")
         for provider in configured:
-            print(f"   • {PROVIDERS[provider]['name']}")
+            info = PROVIDERS[provider]
+            print(f"   • {info['name']}")
         print()
     else:
         print("ℹ️  No API keys configured yet.")
@@ -330,13 +437,16 @@ def interactive_setup():
 
 def add_api_key_wizard(manager: APIKeyManager):
     """Wizard for adding a new API key"""
+    import webbrowser
+    
     print_header("➕ ADD NEW API KEY")
     
     # Show available providers
     print("Available providers:\n")
-    for i, (provider_id, info) in enumerate(PROVIDERS.items(), 1):
-        status = "✅" if manager.get_key(provider_id) else "  "
-        print(f"{status} {i}. {info['name']} - {info['description']}")
+    keys = manager.get_keys_bulk(PROVIDERS)
+    for i, provider_id in enumerate(PROVIDERS, 1):
+        status = "✅" if keys[provider_id] else "  "
+        print(f"{status} {i}. {_PROVIDER_MENU_LINES[provider_id]}")
     
     print(f"\n   0. Cancel")
     
@@ -347,7 +457,7 @@ def add_api_key_wizard(manager: APIKeyManager):
         
     try:
         idx = int(choice) - 1
-        provider_id = list(PROVIDERS.keys())[idx]
+        provider_id = _PROVIDER_IDS[idx]
     except (ValueError, IndexError):
         print("❌ Invalid selection")
         return
@@ -405,7 +515,7 @@ def view_provider_info():
         
     try:
         idx = int(choice) - 1
-        provider_id = list(PROVIDERS.keys())[idx]
+        provider_id = _PROVIDER_IDS[idx]
         print_provider_info(provider_id)
         input("\nPress Enter to continue...")
     except (ValueError, IndexError):
@@ -416,14 +526,21 @@ def list_providers(manager: APIKeyManager):
     """List all providers and their configuration status"""
     print_header("📊 PROVIDER STATUS")
     
+    keys = manager.get_keys_bulk(PROVIDERS)
+    lines = []
     for provider_id, info in PROVIDERS.items():
-        configured = manager.get_key(provider_id) is not None
+        configured = keys[provider_id] is not None
         status = "✅ Configured" if configured else "⚪ Not configured"
         
-        print(f"{status} - {info['name']}")
-        print(f"           {info['description']}")
-        print(f"           Free tier: {info['free_tier']}")
-        print()
+        name, description, free_tier = info['name'], info['description'], info['free_tier']
+        lines.append(f"{status} - {name}")
+        lines.append(f"           {description}")
+        lines.append(f"           Free tier: {free_tier}")
+        lines.append("")
+    
+    # One write for the whole screen instead of four prints per provider
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
     
     input("Press Enter to continue...")
 
@@ -440,7 +557,8 @@ def remove_api_key(manager: APIKeyManager):
     
     print("Configured providers:\n")
     for i, provider_id in enumerate(configured, 1):
-        print(f"{i}. {PROVIDERS[provider_id]['name']}")
+        info = PROVIDERS[provider_id]
+        print(f"{i}. {info['name']}")
     
     print("\n0. Cancel")
     
@@ -472,8 +590,9 @@ def test_api_keys(manager: APIKeyManager):
     
     print("Testing configured providers...\n")
     
+    keys = manager.get_keys_bulk(configured)
     for provider_id in configured:
-        key = manager.get_key(provider_id)
+        key = keys[provider_id]
         provider = PROVIDERS[provider_id]
         
         print(f"Testing {provider['name']}...", end=" ")
@@ -490,6 +609,8 @@ def test_api_keys(manager: APIKeyManager):
 
 def open_signup_pages():
     """Open all signup pages in browser"""
+    import webbrowser
+    
     print_header("🌐 OPEN SIGNUP PAGES")
     
     print("This will open signup pages for all providers in your browser.\n")
@@ -499,9 +620,13 @@ def open_signup_pages():
         return
     
     print("\nOpening pages...\n")
-    for provider_id, info in PROVIDERS.items():
+    for info in PROVIDERS.values():
         print(f"Opening {info['name']}...")
-        webbrowser.open(info['signup_url'])
+    
+    # Each open() may spawn a launcher process; run them side by side
+    urls = [info['signup_url'] for info in PROVIDERS.values()]
+    with ThreadPoolExecutor(max_workers=len(urls)) as executor:
+        list(executor.map(webbrowser.open, urls))
     
     print(f"\n✅ Opened {len(PROVIDERS)} signup pages")
     input("\nPress Enter to continue...")
@@ -509,15 +634,18 @@ def open_signup_pages():
 
 def quick_setup(provider: str = "openrouter"):
     """Quick setup for a specific provider"""
-    manager = APIKeyManager()
+    import webbrowser
+    
+    manager = get_api_key_manager()
+    info = PROVIDERS[provider]
     
-    print_header(f"🚀 QUICK SETUP - {PROVIDERS[provider]['name']}")
+    print_header(f"🚀 QUICK SETUP - {info['name']}")
     
     print_provider_info(provider)
     
     # Open signup page
     print(f"\n🌐 Opening signup page...")
-    webbrowser.open(PROVIDERS[provider]['signup_url'])
+    webbrowser.open(info['signup_url'])
     
     # Get key
     print(f"\n🔑 After signing up, paste your API key below:")
@@ -525,7 +653,7 @@ def quick_setup(provider: str = "openrouter"):
     
     if api_key and manager.validate_key_format(provider, api_key):
         manager.save_key(provider, api_key)
-        print(f"\n✅ Setup complete! You can now use {PROVIDERS[provider]['name']}")
+        print(f"\n✅ Setup complete! You can now use {info['name']}")
     else:
         print("\n⚠️  Setup cancelled or invalid key")
 
@@ -542,7 +670,7 @@ def main():
                 quick_setup(provider)
             else:
                 print(f"❌ Unknown provider: {provider}")
-                print(f"Available: {', '.join(PROVIDERS.keys())}")
+                print(f"Available: {', '.join(_PROVIDER_IDS)}")
         else:
             print("Usage:")
             print("  python api_keys.py              # Interactive wizard")
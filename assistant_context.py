@@ -8,14 +8,37 @@ Allows you to configure assistant name, personality, and context preferences.
 
 from pathlib import Path
 import json
+import sys
 from datetime import datetime
 from typing import Dict, Optional
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
 
 CONFIG_DIR = Path.home() / ".gh-ai-assistant"
 CONTEXT_FILE = CONFIG_DIR / "assistant_context.json"
 
 
+def _loads(data: bytes) -> Dict:
+    """Parse JSON bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _dumps(obj: Dict, sort_keys: bool = False) -> bytes:
+    """Serialize to JSON bytes (indented unless sort_keys is requested)"""
+    if orjson is not None:
+        option = orjson.OPT_SORT_KEYS if sort_keys else orjson.OPT_INDENT_2
+        return orjson.dumps(obj, option=option)
+    if sort_keys:
+        return json.dumps(obj, sort_keys=True).encode()
+    return json.dumps(obj, indent=2).encode()
+
+
 class AssistantContext:
     """Manages persistent assistant context and preferences"""
     
@@ -24,6 +47,12 @@ class AssistantContext:
         self.context_file = CONTEXT_FILE
         self._ensure_config_dir()
         self.context = self._load_context()
+        # Serialized form of what is on disk; None until the file exists
+        self._saved_state = (
+            self._serialize(self.context) if self.context_file.exists() else None
+        )
+        self._prompt_cache: Optional[str] = None
+        self._refresh_traits_block()
         
     def _ensure_config_dir(self):
         """Create config directory if needed"""
@@ -32,10 +61,10 @@ class AssistantContext:
     def _load_context(self) -> Dict:
         """Load existing context or create default"""
         if self.context_file.exists():
-            with open(self.context_file, 'r') as f:
-                return json.load(f)
+            return _loads(self.context_file.read_bytes())
         
         # Default context
+        now = datetime.now().isoformat()
         return {
             "assistant_name": "Brakel",
             "user_name": "Declan",
@@ -52,23 +81,43 @@ class AssistantContext:
                 "technical_focus": "Python, AI systems, FastAPI",
                 "communication_style": "concise and professional"
             },
-            "created_at": datetime.now().isoformat(),
-            "last_updated": datetime.now().isoformat()
+            "created_at": now,
+            "last_updated": now
         }
         
+    def _refresh_traits_block(self):
+        """Pre-render the personality traits bullet list for the system prompt"""
+        self._traits_block = "\n".join(
+            f"- {trait}" for trait in self.context.get('personality_traits', [])
+        )
+        
+    @staticmethod
+    def _serialize(context: Dict) -> bytes:
+        """Canonical form used to detect unsaved changes"""
+        return _dumps(context, sort_keys=True)
+        
     def save_context(self):
-        """Save context to file"""
+        """Save context to file (skipped when nothing changed)"""
+        if self._serialize(self.context) == self._saved_state:
+            return
+            
         self.context['last_updated'] = datetime.now().isoformat()
+        self._prompt_cache = None
         
-        with open(self.context_file, 'w') as f:
-            json.dump(self.context, indent=2, fp=f)
+        # Write to a sibling file and swap it in so readers never see a partial file
+        tmp_file = self.context_file.with_suffix('.tmp')
+        tmp_file.write_bytes(_dumps(self.context))
+        tmp_file.replace(self.context_file)
+        self._saved_state = self._serialize(self.context)
             
     def get_system_prompt(self) -> str:
-        """Generate system prompt with context"""
+        """Generate system prompt with context (cached until the context changes)"""
+        if self._prompt_cache is not None:
+            return self._prompt_cache
+            
         name = self.context.get('assistant_name', 'Assistant')
         user = self.context.get('user_name', 'User')
         project = self.context.get('project_context', 'gh-ai-assistant')
-        traits = self.context.get('personality_traits', [])
         prefs = self.context.get('preferences', {})
         
         prompt = f"""You are {name}, {user}'s personal AI coding partner.
@@ -77,7 +126,7 @@ PROJECT CONTEXT:
 {project}
 
 YOUR ROLE:
-{chr(10).join(f'- {trait}' for trait in traits)}
+{self._traits_block}
 
 PREFERENCES:
 - Technical Focus: {prefs.get('technical_focus', 'General development')}
@@ -90,6 +139,7 @@ CURRENT SESSION:
 - Features: Memory Transfer, Memory Bridge, Token Optimization
 - Goal: Build enterprise-grade AI reliability system
 """
+        self._prompt_cache = prompt
         return prompt
         
     def get_greeting(self) -> str:
@@ -107,28 +157,36 @@ CURRENT SESSION:
             elif key in self.context.get('preferences', {}):
                 self.context['preferences'][key] = value
                 
+        if 'personality_traits' in kwargs:
+            self._refresh_traits_block()
+        self._prompt_cache = None
         self.save_context()
         
     def display_context(self):
         """Display current context"""
-        print("╔══════════════════════════════════════════════════════════════════════╗")
-        print("║              ASSISTANT CONTEXT CONFIGURATION                         ║")
-        print("╚══════════════════════════════════════════════════════════════════════╝")
-        print()
-        print(f"Assistant Name: {self.context.get('assistant_name')}")
-        print(f"User Name: {self.context.get('user_name')}")
-        print(f"Project: {self.context.get('project_context')}")
-        print()
-        print("Personality Traits:")
+        lines = [
+            "╔══════════════════════════════════════════════════════════════════════╗",
+            "║              ASSISTANT CONTEXT CONFIGURATION                         ║",
+            "╚══════════════════════════════════════════════════════════════════════╝",
+            "",
+            f"Assistant Name: {self.context.get('assistant_name')}",
+            f"User Name: {self.context.get('user_name')}",
+            f"Project: {self.context.get('project_context')}",
+            "",
+            "Personality Traits:",
+        ]
         for trait in self.context.get('personality_traits', []):
-            print(f"  • {trait}")
-        print()
-        print("Preferences:")
+            lines.append(f"  • {trait}")
+        lines.append("")
+        lines.append("Preferences:")
         for key, value in self.context.get('preferences', {}).items():
-            print(f"  • {key}: {value}")
-        print()
-        print(f"Last Updated: {self.context.get('last_updated')}")
-        print()
+            lines.append(f"  • {key}: {value}")
+        lines.append("")
+        lines.append(f"Last Updated: {self.context.get('last_updated')}")
+        lines.append("")
+        
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
 
 
 def main():
@@ -154,6 +212,11 @@ def main():
     
     args = parser.parse_args()
     
+    if not (args.show or args.greeting or args.prompt or args.set_name
+            or args.set_user or args.reset):
+        parser.print_help()
+        return
+        
     context = AssistantContext()
     
     if args.show:
@@ -184,9 +247,6 @@ def main():
         print("✅ Context reset to defaults")
         context = AssistantContext()
         context.save_context()
-        
-    else:
-        parser.print_help()
 
 
 if __name__ == "__main__":
@@ -7,17 +7,284 @@ Distributed cognitive processing with shared state, adaptive evolution,
 and autonomous resource allocation.
 """
 
-from typing import Dict, List, Optional, Set
+from typing import Deque, Dict, FrozenSet, Iterable, Iterator, List, Optional, Set, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
+from collections import deque
+from contextlib import contextmanager
+from functools import lru_cache
+from operator import itemgetter
+from types import MappingProxyType
+import bisect
+import copy
+import hashlib
+import heapq
 import json
+import queue
 import sqlite3
+import sys
+import threading
+import time
 from pathlib import Path
 from enum import Enum
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
 # Configuration
 CONFIG_DIR = Path.home() / ".gh-ai-assistant"
 COLLECTIVE_DB = CONFIG_DIR / "collective_intelligence.db"
+RECENT_MEMORY_LIMIT = 1024
+HEARTBEAT_TIMEOUT = 300  # seconds without a heartbeat before a node is skipped
+WRITE_BATCH_LIMIT = 256  # queued writes committed per writer-thread transaction
+WRITE_BATCH_WINDOW = 0.05  # seconds the writer waits to fill a batch
+
+
+# Strategy templates based on challenge type
+_STRATEGY_TEMPLATES = MappingProxyType({
+    "rate_limit": {
+        "actions": [
+            "switch_to_next_best_model",
+            "use_local_fallback",
+            "wait_and_retry"
+        ],
+        "priority": "availability",
+        "timeout": 60
+    },
+    "empty_response": {
+        "actions": [
+            "try_different_model",
+            "adjust_prompt",
+            "check_model_health"
+        ],
+        "priority": "reliability",
+        "timeout": 30
+    },
+    "slow_response": {
+        "actions": [
+            "use_faster_model",
+            "cache_result",
+            "parallel_request"
+        ],
+        "priority": "speed",
+        "timeout": 15
+    },
+    "all_models_failed": {
+        "actions": [
+            "use_ollama_local",
+            "queue_for_retry",
+            "notify_user"
+        ],
+        "priority": "resilience",
+        "timeout": 120
+    }
+})
+
+_DEFAULT_STRATEGY = MappingProxyType({
+    "actions": ["fallback_to_default"],
+    "priority": "stability",
+    "timeout": 60
+})
+
+
+# Statements reused on every call; one constant each so sqlite3's statement
+# cache always sees the identical string
+_SQL_UPSERT_NODE = '''
+    INSERT OR REPLACE INTO nodes
+    (node_id, node_type, capabilities, performance_score,
+     current_load, last_heartbeat, state, knowledge_domains)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+_SQL_INSERT_MEMORY = '''
+    INSERT INTO collective_memory
+    (memory_type, content, importance, nodes_accessed)
+    VALUES (?, ?, ?, ?)
+'''
+
+_SQL_MERGE_PATTERN = '''
+    INSERT INTO learned_patterns
+    (pattern_type, pattern_data, confidence, pattern_hash)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT(pattern_type, pattern_hash) DO UPDATE
+    SET confidence = MIN(1.0, confidence + 0.1),
+        times_validated = times_validated + 1,
+        last_updated = CURRENT_TIMESTAMP
+'''
+
+# Read back in the same transaction as the merge (RETURNING needs SQLite 3.35)
+_SQL_SELECT_PATTERN_STATS = '''
+    SELECT confidence, times_validated
+    FROM learned_patterns
+    WHERE pattern_type = ? AND pattern_hash = ?
+'''
+
+_SQL_SELECT_PATTERNS_BY_TYPE = '''
+    SELECT pattern_type, pattern_data, confidence, times_validated
+    FROM learned_patterns
+    WHERE pattern_type = ? AND confidence >= ?
+    ORDER BY confidence DESC, times_validated DESC
+'''
+
+_SQL_SELECT_PATTERNS = '''
+    SELECT pattern_type, pattern_data, confidence, times_validated
+    FROM learned_patterns
+    WHERE confidence >= ?
+    ORDER BY confidence DESC, times_validated DESC
+'''
+
+_SQL_BUMP_STRATEGY_USAGE = '''
+    UPDATE overcome_strategies
+    SET times_used = times_used + 1
+    WHERE challenge_type = ? AND strategy_hash = ?
+'''
+
+_SQL_UPSERT_STRATEGY = '''
+    INSERT INTO overcome_strategies
+    (challenge_type, strategy, success_rate, times_used, strategy_hash)
+    VALUES (?, ?, 0.5, 1, ?)
+    ON CONFLICT(challenge_type, strategy_hash) DO UPDATE
+    SET times_used = times_used + 1
+'''
+
+_SQL_SELECT_BEST_STRATEGY = '''
+    SELECT strategy, success_rate, avg_resolution_time, strategy_hash
+    FROM overcome_strategies
+    WHERE challenge_type = ?
+    ORDER BY success_rate DESC, avg_resolution_time ASC
+    LIMIT 1
+'''
+
+_SQL_SELECT_STRATEGY_STATS = '''
+    SELECT success_rate, times_used, avg_resolution_time
+    FROM overcome_strategies
+    WHERE challenge_type = ? AND strategy_hash = ?
+'''
+
+_SQL_UPDATE_STRATEGY_OUTCOME = '''
+    UPDATE overcome_strategies
+    SET success_rate = ?,
+        avg_resolution_time = ?,
+        times_used = times_used + 1
+    WHERE challenge_type = ? AND strategy_hash = ?
+'''
+
+# Folds n outcomes (successes, total time) into the running averages at once;
+# every right-hand side sees the pre-update row
+_SQL_MERGE_STRATEGY_OUTCOMES = '''
+    UPDATE overcome_strategies
+    SET success_rate = (success_rate * times_used + ?) / (times_used + ?),
+        avg_resolution_time = (avg_resolution_time * times_used + ?) / (times_used + ?),
+        times_used = times_used + ?
+    WHERE challenge_type = ? AND strategy_hash = ?
+'''
+
+_SQL_AVG_PERFORMANCE = 'SELECT AVG(performance_score) FROM nodes'
+
+_SQL_COLLECTIVE_STATUS = '''
+    SELECT
+        (SELECT COUNT(*) FROM nodes),
+        (SELECT AVG(performance_score) FROM nodes),
+        (SELECT AVG(current_load) FROM nodes),
+        (SELECT COUNT(*) FROM collective_memory),
+        (SELECT COUNT(*) FROM learned_patterns),
+        (SELECT AVG(confidence) FROM learned_patterns),
+        (SELECT COUNT(*) FROM overcome_strategies),
+        (SELECT AVG(success_rate) FROM overcome_strategies)
+'''
+
+
+def _swar_popcount(x: int) -> int:
+    """Count set bits 64 at a time with the classic SWAR reduction"""
+    count = 0
+    while x:
+        word = x & 0xFFFFFFFFFFFFFFFF
+        word = word - ((word >> 1) & 0x5555555555555555)
+        word = (word & 0x3333333333333333) + ((word >> 2) & 0x3333333333333333)
+        word = (word + (word >> 4)) & 0x0F0F0F0F0F0F0F0F
+        count += ((word * 0x0101010101010101) & 0xFFFFFFFFFFFFFFFF) >> 56
+        x >>= 64
+    return count
+
+
+# int.bit_count (Python 3.10+) compiles to a single POPCNT
+_popcount = getattr(int, "bit_count", _swar_popcount)
+
+
+def _dumps(obj) -> str:
+    """Serialize a value for a TEXT column, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(obj)
+
+
+def _loads(data):
+    """Parse a JSON column value, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _canonical_json(obj) -> Tuple[str, bytes]:
+    """
+    Key-order independent JSON text plus a 128-bit digest for indexed lookups
+    Always stdlib json so stored hashes do not depend on whether orjson is installed
+    """
+    text = json.dumps(obj, sort_keys=True, separators=(",", ":"))
+    return text, _digest(text)
+
+
+def _digest(text: str) -> bytes:
+    """128-bit BLAKE2b digest of canonical JSON text"""
+    return hashlib.blake2b(text.encode(), digest_size=16).digest()
+
+
+def _drain_writes(write_queue: "queue.Queue", conn: sqlite3.Connection,
+                  errors: List[sqlite3.Error]):
+    """
+    Writer thread body: commit queued (sql, rows) batches in shared transactions
+    Each write gets its own savepoint so a failing one is rolled back alone and
+    appended to `errors`. A None item closes the connection and ends the thread
+    """
+    while True:
+        batch = [write_queue.get()]
+        deadline = time.monotonic() + WRITE_BATCH_WINDOW
+        while batch[-1] is not None and len(batch) < WRITE_BATCH_LIMIT:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(write_queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+                
+        writes = [item for item in batch if item is not None]
+        if writes:
+            try:
+                conn.execute('BEGIN IMMEDIATE')
+                for sql, rows in writes:
+                    conn.execute('SAVEPOINT queued_write')
+                    try:
+                        conn.executemany(sql, rows)
+                    except sqlite3.Error as e:
+                        conn.execute('ROLLBACK TO queued_write')
+                        errors.append(e)
+                        print(f"⚠️  Collective write failed: {e}")
+                    conn.execute('RELEASE queued_write')
+                conn.execute('COMMIT')
+            except sqlite3.Error as e:
+                if conn.in_transaction:
+                    conn.execute('ROLLBACK')
+                errors.extend([e] * len(writes))
+                print(f"⚠️  Collective write batch failed: {e}")
+                
+        for _ in batch:
+            write_queue.task_done()
+        if batch[-1] is None:
+            conn.close()
+            return
 
 
 class CollectiveState(Enum):
@@ -28,21 +295,40 @@ class CollectiveState(Enum):
     OPTIMAL = "optimal"            # Peak performance
 
 
+# Average performance cut-offs (exclusive) and the state each bucket maps to
+_PERFORMANCE_THRESHOLDS = (25, 50, 75)
+_PERFORMANCE_STATES = (
+    CollectiveState.ASSIMILATING,
+    CollectiveState.OVERCOMING,
+    CollectiveState.LEARNING,
+    CollectiveState.OPTIMAL,
+)
+
+
 @dataclass
 class CollectiveNode:
     """Individual node in the hive mind (model or agent)"""
     node_id: str
     node_type: str  # "cloud_model", "local_model", "agent"
-    capabilities: List[str]
+    capabilities: Tuple[str, ...]
     current_load: float  # 0-1
     performance_score: float  # 0-100
-    last_heartbeat: datetime
+    last_heartbeat: float  # epoch seconds (datetime accepted)
     state: CollectiveState
-    knowledge_domains: Set[str] = field(default_factory=set)
+    knowledge_domains: FrozenSet[str] = field(default_factory=frozenset)
     
-    def is_available(self) -> bool:
-        """Check if node is responsive"""
-        return (datetime.now() - self.last_heartbeat).seconds < 300  # 5 min
+    def __post_init__(self):
+        # Fixed after assimilation; tuple keeps the declared order for display
+        self.capabilities = tuple(self.capabilities)
+        self.knowledge_domains = frozenset(self.knowledge_domains)
+        if isinstance(self.last_heartbeat, datetime):
+            self.last_heartbeat = self.last_heartbeat.timestamp()
+        
+    def is_available(self, now: Optional[float] = None) -> bool:
+        """Check if node is responsive (pass `now` to reuse one clock read)"""
+        if now is None:
+            now = time.time()
+        return now - self.last_heartbeat < HEARTBEAT_TIMEOUT
 
 
 @dataclass
@@ -66,23 +352,138 @@ class HiveMind:
     3. Overcome - Never fail, always find a path forward
     """
     
-    def __init__(self):
+    def __init__(self, async_writes: bool = False):
         self.db_path = COLLECTIVE_DB
         self._ensure_config_dir()
+        self._conn = self._connect()
         self._init_collective_db()
+        # Fire-and-forget writes (nodes, memories) can be handed to a writer
+        # thread with its own connection so callers never wait on a commit
+        self._write_queue: Optional[queue.Queue] = None
+        self._writer: Optional[threading.Thread] = None
+        # Failures recorded by the writer thread, reported by flush()/close()
+        self._write_errors: List[sqlite3.Error] = []
+        if async_writes:
+            self._write_queue = queue.Queue()
+            self._writer = threading.Thread(
+                target=_drain_writes,
+                args=(self._write_queue, self._connect(), self._write_errors),
+                name="hivemind-writer", daemon=True
+            )
+            self._writer.start()
         self.active_nodes: Dict[str, CollectiveNode] = {}
-        self.shared_memory: List[CollectiveMemory] = []
+        # Bounded window of recent memories; SQLite holds the full history
+        self._recent_memory: Deque[CollectiveMemory] = deque(maxlen=RECENT_MEMORY_LIMIT)
         self.collective_state = CollectiveState.OPTIMAL
+        # challenge_type -> best strategy row; cleared when strategies change
+        self._best_strategy_cache: Dict[str, Optional[tuple]] = {}
+        # Capabilities/domains are interned as bit positions so node scoring
+        # is integer mask arithmetic instead of per-node set construction
+        self._capability_bits: Dict[str, int] = {}
+        self._domain_bits: Dict[str, int] = {}
+        self._node_masks: Dict[str, Tuple[int, int]] = {}
         
     def _ensure_config_dir(self):
         """Ensure collective storage exists"""
         CONFIG_DIR.mkdir(parents=True, exist_ok=True)
         
+    def _connect(self) -> sqlite3.Connection:
+        """Open the long-lived connection shared by every HiveMind operation"""
+        conn = sqlite3.connect(
+            self.db_path, isolation_level=None, check_same_thread=False,
+            cached_statements=256
+        )
+        conn.executescript('''
+            PRAGMA journal_mode = WAL;
+            PRAGMA synchronous = NORMAL;
+            PRAGMA temp_store = MEMORY;
+            PRAGMA cache_size = -64000;
+        ''')
+        return conn
+        
+    @contextmanager
+    def _transaction(self) -> Iterator[sqlite3.Cursor]:
+        """Run a group of statements in one explicit write transaction"""
+        if self._conn is None:
+            raise sqlite3.ProgrammingError("HiveMind has been closed")
+        cursor = self._conn.cursor()
+        cursor.execute('BEGIN IMMEDIATE')
+        try:
+            yield cursor
+        except BaseException:
+            cursor.execute('ROLLBACK')
+            raise
+        cursor.execute('COMMIT')
+        
+    def _write(self, sql: str, rows: List[tuple]):
+        """Apply a batched write now, or queue it for the writer thread"""
+        if self._write_queue is not None:
+            self._write_queue.put((sql, rows))
+            return
+        with self._transaction() as cursor:
+            cursor.executemany(sql, rows)
+            
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Wait until every queued write has been committed
+        
+        Returns:
+            False if the timeout expired first
+            
+        Raises:
+            sqlite3.DatabaseError: if queued writes failed since the last check
+        """
+        if self._write_queue is None:
+            return True
+        write_queue = self._write_queue
+        with write_queue.all_tasks_done:
+            done = write_queue.all_tasks_done.wait_for(
+                lambda: not write_queue.unfinished_tasks, timeout
+            )
+        self._raise_write_errors()
+        return done
+        
+    def _raise_write_errors(self):
+        """Report (and forget) writes the writer thread had to roll back"""
+        if not self._write_errors:
+            return
+        errors = self._write_errors[:]
+        del self._write_errors[:len(errors)]
+        raise sqlite3.DatabaseError(
+            f"{len(errors)} queued collective write(s) failed: {errors[0]}"
+        ) from errors[0]
+            
+    def close(self):
+        """
+        Drain queued writes and close the database connections
+        
+        Raises:
+            sqlite3.DatabaseError: if any queued write failed and was not
+            already reported by flush()
+        """
+        if self._writer is not None:
+            self._write_queue.put(None)
+            self._writer.join()
+            self._writer = None
+            self._write_queue = None
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        self._raise_write_errors()
+            
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+            
     def _init_collective_db(self):
         """Initialize collective intelligence database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
+        with self._transaction() as cursor:
+            self._create_tables(cursor)
+            
+    def _create_tables(self, cursor: sqlite3.Cursor):
+        """Create the collective tables if they do not exist"""
         # Node registry
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS nodes (
@@ -91,11 +492,17 @@ class HiveMind:
                 capabilities TEXT,
                 performance_score REAL DEFAULT 50.0,
                 current_load REAL DEFAULT 0.0,
-                last_heartbeat DATETIME DEFAULT CURRENT_TIMESTAMP,
+                last_heartbeat REAL DEFAULT ((julianday('now') - 2440587.5) * 86400.0),
                 state TEXT DEFAULT 'optimal',
                 knowledge_domains TEXT
             )
         ''')
+        # Heartbeats are epoch seconds; older databases stored local-time text
+        cursor.execute('''
+            UPDATE nodes
+            SET last_heartbeat = (julianday(last_heartbeat, 'utc') - 2440587.5) * 86400.0
+            WHERE typeof(last_heartbeat) = 'text'
+        ''')
         
         # Collective memory
         cursor.execute('''
@@ -119,9 +526,11 @@ class HiveMind:
                 confidence REAL DEFAULT 0.5,
                 times_validated INTEGER DEFAULT 0,
                 created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-                last_updated DATETIME DEFAULT CURRENT_TIMESTAMP
+                last_updated DATETIME DEFAULT CURRENT_TIMESTAMP,
+                pattern_hash BLOB
             )
         ''')
+        self._migrate_hash_column(cursor, 'learned_patterns', 'pattern_data', 'pattern_hash')
         
         # Overcome strategies
         cursor.execute('''
@@ -131,12 +540,60 @@ class HiveMind:
                 strategy TEXT NOT NULL,
                 success_rate REAL DEFAULT 0.0,
                 times_used INTEGER DEFAULT 0,
-                avg_resolution_time REAL DEFAULT 0.0
+                avg_resolution_time REAL DEFAULT 0.0,
+                strategy_hash BLOB
             )
         ''')
+        self._migrate_hash_column(cursor, 'overcome_strategies', 'strategy', 'strategy_hash')
         
-        conn.commit()
-        conn.close()
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_memory_timestamp
+            ON collective_memory(timestamp DESC)
+        ''')
+        
+        # One row per (type, canonical data) so learn_pattern can UPSERT
+        cursor.execute('''
+            CREATE UNIQUE INDEX IF NOT EXISTS ux_patterns
+            ON learned_patterns(pattern_type, pattern_hash)
+        ''')
+        cursor.execute('''
+            CREATE UNIQUE INDEX IF NOT EXISTS ux_strategies
+            ON overcome_strategies(challenge_type, strategy_hash)
+        ''')
+        
+        # Serve the ORDER BY of the pattern/strategy lookups from an index.
+        # The pattern index also carries pattern_data so typed lookups are
+        # answered from the index alone; it supersedes idx_patterns_type_conf
+        cursor.execute('DROP INDEX IF EXISTS idx_patterns_type_conf')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_patterns_cov
+            ON learned_patterns(pattern_type, confidence DESC, times_validated DESC,
+                                pattern_data)
+        ''')
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_strategies_challenge
+            ON overcome_strategies(challenge_type, success_rate DESC, avg_resolution_time ASC)
+        ''')
+        
+    def _migrate_hash_column(self, cursor: sqlite3.Cursor, table: str,
+                             json_column: str, hash_column: str):
+        """Add and backfill a canonical-JSON hash column on older databases"""
+        columns = {row[1] for row in cursor.execute(f'PRAGMA table_info({table})')}
+        if hash_column in columns:
+            return
+            
+        cursor.execute(f'ALTER TABLE {table} ADD COLUMN {hash_column} BLOB')
+        rows = cursor.execute(f'SELECT id, {json_column} FROM {table}').fetchall()
+        # Later duplicates of an already-hashed row keep a NULL hash so the
+        # unique index can still be built
+        hashes = {}
+        for row_id, data in rows:
+            row_hash = _canonical_json(_loads(data))[1]
+            hashes.setdefault(row_hash, row_id)
+        cursor.executemany(
+            f'UPDATE {table} SET {hash_column} = ? WHERE id = ?',
+            hashes.items()
+        )
         
     # ═══════════════════════════════════════════════════════════
     # ASSIMILATE - Gather and integrate knowledge
@@ -147,54 +604,54 @@ class HiveMind:
         Assimilate a new node into the collective
         "You will be assimilated. Resistance is futile."
         """
-        self.active_nodes[node.node_id] = node
+        self.assimilate_nodes([node])
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def assimilate_nodes(self, nodes: Iterable[CollectiveNode]):
+        """Assimilate many nodes with a single batched write"""
+        nodes = list(nodes)
+        rows = []
+        for node in nodes:
+            self.active_nodes[node.node_id] = node
+            self._index_node(node)
+            rows.append((
+                node.node_id,
+                node.node_type,
+                _dumps(node.capabilities),
+                node.performance_score,
+                node.current_load,
+                node.last_heartbeat,
+                node.state.value,
+                _dumps(list(node.knowledge_domains))
+            ))
+            
+        self._write(_SQL_UPSERT_NODE, rows)
         
-        cursor.execute('''
-            INSERT OR REPLACE INTO nodes 
-            (node_id, node_type, capabilities, performance_score, 
-             current_load, last_heartbeat, state, knowledge_domains)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            node.node_id,
-            node.node_type,
-            json.dumps(node.capabilities),
-            node.performance_score,
-            node.current_load,
-            node.last_heartbeat,
-            node.state.value,
-            json.dumps(list(node.knowledge_domains))
-        ))
-        
-        conn.commit()
-        conn.close()
-        
-        print(f"🤖 Assimilated: {node.node_id} ({node.node_type})")
-        print(f"   Capabilities: {', '.join(node.capabilities)}")
-        print(f"   Performance: {node.performance_score:.1f}/100")
+        for node in nodes:
+            print(f"🤖 Assimilated: {node.node_id} ({node.node_type})")
+            print(f"   Capabilities: {', '.join(node.capabilities)}")
+            print(f"   Performance: {node.performance_score:.1f}/100")
         
     def assimilate_knowledge(self, memory: CollectiveMemory):
         """Store knowledge in collective memory"""
-        self.shared_memory.append(memory)
+        self.assimilate_knowledge_bulk([memory])
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def assimilate_knowledge_bulk(self, memories: Iterable[CollectiveMemory]):
+        """Store many memories with a single batched write"""
+        rows = []
+        for memory in memories:
+            self._recent_memory.append(memory)
+            rows.append((
+                memory.memory_type,
+                _dumps(memory.content),
+                memory.importance,
+                _dumps(list(memory.nodes_accessed))
+            ))
+            
+        self._write(_SQL_INSERT_MEMORY, rows)
         
-        cursor.execute('''
-            INSERT INTO collective_memory 
-            (memory_type, content, importance, nodes_accessed)
-            VALUES (?, ?, ?, ?)
-        ''', (
-            memory.memory_type,
-            json.dumps(memory.content),
-            memory.importance,
-            json.dumps(list(memory.nodes_accessed))
-        ))
-        
-        conn.commit()
-        conn.close()
+    def recent_memory(self) -> List[CollectiveMemory]:
+        """Memories assimilated by this instance, oldest first (bounded)"""
+        return list(self._recent_memory)
         
     # ═══════════════════════════════════════════════════════════
     # LEARN - Adapt and optimize from experience
@@ -206,81 +663,54 @@ class HiveMind:
         Learn a new pattern from observed behavior
         Collective learns and all nodes benefit
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        with self._transaction() as cursor:
+            self._learn_pattern(cursor, pattern_type, pattern_data, confidence)
         
-        # Check if pattern exists
-        cursor.execute('''
-            SELECT id, confidence, times_validated 
-            FROM learned_patterns 
-            WHERE pattern_type = ? AND pattern_data = ?
-        ''', (pattern_type, json.dumps(pattern_data)))
-        
-        existing = cursor.fetchone()
-        
-        if existing:
-            # Strengthen existing pattern
-            pattern_id, old_confidence, times_validated = existing
-            new_confidence = min(1.0, old_confidence + 0.1)
-            
-            cursor.execute('''
-                UPDATE learned_patterns 
-                SET confidence = ?,
-                    times_validated = times_validated + 1,
-                    last_updated = CURRENT_TIMESTAMP
-                WHERE id = ?
-            ''', (new_confidence, pattern_id))
-            
+        self.collective_state = CollectiveState.LEARNING
+        
+    def _learn_pattern(self, cursor: sqlite3.Cursor, pattern_type: str,
+                       pattern_data: Dict, confidence: float):
+        """Insert or reinforce a pattern inside the caller's transaction"""
+        pattern_json, pattern_hash = _canonical_json(pattern_data)
+        self._store_pattern(cursor, (pattern_type, pattern_json, confidence, pattern_hash))
+        
+    def _store_pattern(self, cursor: sqlite3.Cursor, row: Tuple[str, str, float, bytes]):
+        """UPSERT an already-serialized (type, json, confidence, hash) pattern row"""
+        pattern_type, _, confidence, pattern_hash = row
+        cursor.execute(_SQL_MERGE_PATTERN, row)
+        
+        new_confidence, times_validated = cursor.execute(
+            _SQL_SELECT_PATTERN_STATS, (pattern_type, pattern_hash)
+        ).fetchone()
+        
+        if times_validated:
+            # Strengthened an existing pattern
             print(f"📚 Reinforced pattern: {pattern_type}")
-            print(f"   Confidence: {old_confidence:.2f} → {new_confidence:.2f}")
+            print(f"   Confidence: {new_confidence:.2f} "
+                  f"(validated {times_validated}x)")
         else:
-            # Learn new pattern
-            cursor.execute('''
-                INSERT INTO learned_patterns 
-                (pattern_type, pattern_data, confidence)
-                VALUES (?, ?, ?)
-            ''', (pattern_type, json.dumps(pattern_data), confidence))
-            
             print(f"🧠 Learned new pattern: {pattern_type}")
             print(f"   Initial confidence: {confidence:.2f}")
         
-        conn.commit()
-        conn.close()
-        
-        self.collective_state = CollectiveState.LEARNING
-        
     def get_learned_patterns(self, pattern_type: str = None, 
-                           min_confidence: float = 0.5) -> List[Dict]:
-        """Retrieve learned patterns from collective memory"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
+                           min_confidence: float = 0.5) -> Iterator[Dict]:
+        """
+        Stream learned patterns from collective memory, best first
+        Wrap in list() when the full result is needed
+        """
         if pattern_type:
-            cursor.execute('''
-                SELECT pattern_type, pattern_data, confidence, times_validated
-                FROM learned_patterns
-                WHERE pattern_type = ? AND confidence >= ?
-                ORDER BY confidence DESC, times_validated DESC
-            ''', (pattern_type, min_confidence))
+            cursor = self._conn.execute(_SQL_SELECT_PATTERNS_BY_TYPE,
+                                        (pattern_type, min_confidence))
         else:
-            cursor.execute('''
-                SELECT pattern_type, pattern_data, confidence, times_validated
-                FROM learned_patterns
-                WHERE confidence >= ?
-                ORDER BY confidence DESC, times_validated DESC
-            ''', (min_confidence,))
-        
-        patterns = []
-        for row in cursor.fetchall():
-            patterns.append({
+            cursor = self._conn.execute(_SQL_SELECT_PATTERNS, (min_confidence,))
+        
+        for row in cursor:
+            yield {
                 'type': row[0],
-                'data': json.loads(row[1]),
+                'data': _loads(row[1]),
                 'confidence': row[2],
                 'validations': row[3]
-            })
-        
-        conn.close()
-        return patterns
+            }
         
     # ═══════════════════════════════════════════════════════════
     # OVERCOME - Adapt to any challenge, never fail
@@ -294,179 +724,212 @@ class HiveMind:
         """
         self.collective_state = CollectiveState.OVERCOMING
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Look for proven strategies
-        cursor.execute('''
-            SELECT strategy, success_rate, avg_resolution_time
-            FROM overcome_strategies
-            WHERE challenge_type = ?
-            ORDER BY success_rate DESC, avg_resolution_time ASC
-            LIMIT 1
-        ''', (challenge_type,))
-        
-        best_strategy = cursor.fetchone()
-        
-        if best_strategy and best_strategy[1] > 0.5:  # 50% success rate
-            strategy_data = json.loads(best_strategy[0])
-            
-            print(f"🛡️ Applying proven strategy for: {challenge_type}")
-            print(f"   Success rate: {best_strategy[1]*100:.1f}%")
-            print(f"   Avg resolution: {best_strategy[2]:.1f}s")
-            
-            # Update usage count
-            cursor.execute('''
-                UPDATE overcome_strategies
-                SET times_used = times_used + 1
-                WHERE challenge_type = ? AND strategy = ?
-            ''', (challenge_type, best_strategy[0]))
-            
-            conn.commit()
-            conn.close()
+        with self._transaction() as cursor:
+            # Look for proven strategies
+            best_strategy = self._best_strategy(cursor, challenge_type)
             
-            return strategy_data
-        
-        # Create new adaptive strategy
-        new_strategy = self._generate_adaptive_strategy(
-            challenge_type, context
-        )
-        
-        cursor.execute('''
-            INSERT INTO overcome_strategies
-            (challenge_type, strategy, success_rate, times_used)
-            VALUES (?, ?, 0.5, 1)
-        ''', (challenge_type, json.dumps(new_strategy)))
-        
-        conn.commit()
-        conn.close()
+            if best_strategy and best_strategy[1] > 0.5:  # 50% success rate
+                strategy_data = _loads(best_strategy[0])
+            
+                print(f"🛡️ Applying proven strategy for: {challenge_type}")
+                print(f"   Success rate: {best_strategy[1]*100:.1f}%")
+                print(f"   Avg resolution: {best_strategy[2]:.1f}s")
+            
+                # Update usage count
+                cursor.execute(_SQL_BUMP_STRATEGY_USAGE,
+                               (challenge_type, best_strategy[3]))
+            
+                return strategy_data
+            
+            # Create new adaptive strategy
+            new_strategy = self._generate_adaptive_strategy(
+                challenge_type, context
+            )
+            
+            self._best_strategy_cache.pop(challenge_type, None)
+            strategy_json, strategy_hash = _canonical_json(new_strategy)
+            cursor.execute(_SQL_UPSERT_STRATEGY,
+                           (challenge_type, strategy_json, strategy_hash))
         
         print(f"🔧 Generated new adaptive strategy: {challenge_type}")
         
         return new_strategy
         
+    def _best_strategy(self, cursor: sqlite3.Cursor,
+                       challenge_type: str) -> Optional[tuple]:
+        """Highest-rated strategy row for a challenge, memoized per challenge type"""
+        if challenge_type not in self._best_strategy_cache:
+            cursor.execute(_SQL_SELECT_BEST_STRATEGY, (challenge_type,))
+            self._best_strategy_cache[challenge_type] = cursor.fetchone()
+        return self._best_strategy_cache[challenge_type]
+        
     def _generate_adaptive_strategy(self, challenge_type: str, 
                                    context: Dict) -> Dict:
         """Generate adaptive strategy based on collective knowledge"""
-        # Strategy templates based on challenge type
-        strategies = {
-            "rate_limit": {
-                "actions": [
-                    "switch_to_next_best_model",
-                    "use_local_fallback",
-                    "wait_and_retry"
-                ],
-                "priority": "availability",
-                "timeout": 60
-            },
-            "empty_response": {
-                "actions": [
-                    "try_different_model",
-                    "adjust_prompt",
-                    "check_model_health"
-                ],
-                "priority": "reliability",
-                "timeout": 30
-            },
-            "slow_response": {
-                "actions": [
-                    "use_faster_model",
-                    "cache_result",
-                    "parallel_request"
-                ],
-                "priority": "speed",
-                "timeout": 15
-            },
-            "all_models_failed": {
-                "actions": [
-                    "use_ollama_local",
-                    "queue_for_retry",
-                    "notify_user"
-                ],
-                "priority": "resilience",
-                "timeout": 120
-            }
-        }
-        
-        return strategies.get(challenge_type, {
-            "actions": ["fallback_to_default"],
-            "priority": "stability",
-            "timeout": 60
-        })
+        template = _STRATEGY_TEMPLATES.get(challenge_type, _DEFAULT_STRATEGY)
+        # Hand out a copy so callers can adjust it without touching the template
+        return copy.deepcopy(dict(template))
         
     def report_strategy_outcome(self, challenge_type: str, 
                                strategy: Dict, success: bool, 
                                resolution_time: float):
         """Report outcome of strategy to improve collective knowledge"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        self._best_strategy_cache.pop(challenge_type, None)
         
-        strategy_json = json.dumps(strategy)
+        with self._transaction() as cursor:
+            strategy_json, strategy_hash = _canonical_json(strategy)
+            
+            cursor.execute(_SQL_SELECT_STRATEGY_STATS, (challenge_type, strategy_hash))
+            
+            current = cursor.fetchone()
+            
+            if current:
+                old_rate, times_used, old_avg_time = current
+            
+                # Update success rate (weighted average)
+                new_rate = (old_rate * times_used + (1.0 if success else 0.0)) / (times_used + 1)
+            
+                # Update average resolution time
+                new_avg_time = (old_avg_time * times_used + resolution_time) / (times_used + 1)
+            
+                cursor.execute(_SQL_UPDATE_STRATEGY_OUTCOME,
+                               (new_rate, new_avg_time, challenge_type, strategy_hash))
+            
+                print(f"📊 Updated strategy effectiveness:")
+                print(f"   Success rate: {old_rate*100:.1f}% → {new_rate*100:.1f}%")
+                print(f"   Avg time: {old_avg_time:.1f}s → {new_avg_time:.1f}s")
+            
+            # Learn from this outcome in the same transaction
+            self._store_pattern(cursor, self._outcome_pattern(
+                challenge_type, strategy_json, success, resolution_time
+            ))
+            
+        self.collective_state = CollectiveState.LEARNING
         
-        cursor.execute('''
-            SELECT success_rate, times_used, avg_resolution_time
-            FROM overcome_strategies
-            WHERE challenge_type = ? AND strategy = ?
-        ''', (challenge_type, strategy_json))
+    def report_strategy_outcomes_bulk(
+            self, outcomes: Iterable[Tuple[str, Dict, bool, float]]) -> int:
+        """
+        Report many (challenge_type, strategy, success, resolution_time) outcomes
         
-        current = cursor.fetchone()
+        Outcomes are aggregated per strategy and written with executemany in a
+        single transaction, e.g. when replaying logged results.
         
-        if current:
-            old_rate, times_used, old_avg_time = current
+        Returns:
+            Number of outcomes recorded
+        """
+        totals: Dict[Tuple[str, bytes], List[float]] = {}
+        pattern_rows = []
+        for challenge_type, strategy, success, resolution_time in outcomes:
+            strategy_json, strategy_hash = _canonical_json(strategy)
+            total = totals.setdefault((challenge_type, strategy_hash), [0, 0.0, 0.0])
+            total[0] += 1
+            total[1] += 1.0 if success else 0.0
+            total[2] += resolution_time
             
-            # Update success rate (weighted average)
-            new_rate = (old_rate * times_used + (1.0 if success else 0.0)) / (times_used + 1)
+            pattern_rows.append(self._outcome_pattern(
+                challenge_type, strategy_json, success, resolution_time
+            ))
             
-            # Update average resolution time
-            new_avg_time = (old_avg_time * times_used + resolution_time) / (times_used + 1)
+        if not pattern_rows:
+            return 0
             
-            cursor.execute('''
-                UPDATE overcome_strategies
-                SET success_rate = ?,
-                    avg_resolution_time = ?,
-                    times_used = times_used + 1
-                WHERE challenge_type = ? AND strategy = ?
-            ''', (new_rate, new_avg_time, challenge_type, strategy_json))
+        strategy_rows = [
+            (successes, count, total_time, count, count, challenge_type, strategy_hash)
+            for (challenge_type, strategy_hash), (count, successes, total_time)
+            in totals.items()
+        ]
+        
+        with self._transaction() as cursor:
+            cursor.executemany(_SQL_MERGE_STRATEGY_OUTCOMES, strategy_rows)
+            cursor.executemany(_SQL_MERGE_PATTERN, pattern_rows)
             
-            print(f"📊 Updated strategy effectiveness:")
-            print(f"   Success rate: {old_rate*100:.1f}% → {new_rate*100:.1f}%")
-            print(f"   Avg time: {old_avg_time:.1f}s → {new_avg_time:.1f}s")
+        for challenge_type, _ in totals:
+            self._best_strategy_cache.pop(challenge_type, None)
+        self.collective_state = CollectiveState.LEARNING
         
-        conn.commit()
-        conn.close()
+        print(f"📊 Recorded {len(pattern_rows)} strategy outcomes "
+              f"across {len(totals)} strategies")
+        return len(pattern_rows)
         
-        # Learn from this outcome
-        self.learn_pattern(
+    @staticmethod
+    def _outcome_pattern(challenge_type: str, strategy_json: str, success: bool,
+                         resolution_time: float) -> Tuple[str, str, float, bytes]:
+        """
+        Pattern row learned from a single strategy outcome
+        Splices the already-canonical strategy text into the canonical form of
+        {"strategy": ..., "success": ..., "resolution_time": ...} (keys sorted)
+        instead of serializing the strategy a second time
+        """
+        pattern_json = (
+            f'{{"resolution_time":{json.dumps(resolution_time)},'
+            f'"strategy":{strategy_json},'
+            f'"success":{json.dumps(success)}}}'
+        )
+        return (
             f"strategy_outcome_{challenge_type}",
-            {
-                "strategy": strategy,
-                "success": success,
-                "resolution_time": resolution_time
-            },
-            confidence=0.8 if success else 0.3
+            pattern_json,
+            0.8 if success else 0.3,
+            _digest(pattern_json)
         )
         
     # ═══════════════════════════════════════════════════════════
     # COLLECTIVE INTELLIGENCE - Distributed coordination
     # ═══════════════════════════════════════════════════════════
     
+    @staticmethod
+    def _intern_mask(names: Iterable[str], registry: Dict[str, int]) -> int:
+        """Bitmask for names, assigning the next free bit to unseen ones"""
+        mask = 0
+        for name in names:
+            bit = registry.get(name)
+            if bit is None:
+                bit = registry[name] = 1 << len(registry)
+            mask |= bit
+        return mask
+        
+    def _index_node(self, node: CollectiveNode) -> Tuple[int, int]:
+        """Record a node's capability and domain masks"""
+        masks = (
+            self._intern_mask(node.capabilities, self._capability_bits),
+            self._intern_mask(node.knowledge_domains, self._domain_bits),
+        )
+        self._node_masks[node.node_id] = masks
+        return masks
+        
     def select_optimal_nodes(self, task_requirements: Dict, 
                            count: int = 3) -> List[CollectiveNode]:
         """
         Select optimal nodes for a task using collective intelligence
         Considers: capabilities, load, performance, domain knowledge
         """
+        # Requirement masks; a capability no node has means no node qualifies
+        required_caps = 0
+        caps_satisfiable = True
+        for capability in task_requirements.get('capabilities', []):
+            bit = self._capability_bits.get(capability)
+            if bit is None:
+                caps_satisfiable = False
+                break
+            required_caps |= bit
+        required_domains = 0
+        for domain in task_requirements.get('domains', []):
+            required_domains |= self._domain_bits.get(domain, 0)
+        
         candidates = []
+        now = time.time()
+        # Loop-invariant lookups bound once
+        node_masks = self._node_masks.get
+        index_node = self._index_node
         
         for node in self.active_nodes.values():
-            if not node.is_available():
+            if not node.is_available(now):
                 continue
                 
+            cap_mask, domain_mask = node_masks(node.node_id) or index_node(node)
             score = 0.0
             
             # Capability match
-            required_caps = set(task_requirements.get('capabilities', []))
-            if required_caps.issubset(set(node.capabilities)):
+            if caps_satisfiable and cap_mask & required_caps == required_caps:
                 score += 30
             
             # Performance score
@@ -476,119 +939,71 @@ class HiveMind:
             score += (1.0 - node.current_load) * 20
             
             # Domain knowledge
-            required_domains = set(task_requirements.get('domains', []))
-            domain_match = len(required_domains & node.knowledge_domains)
+            domain_match = _popcount(domain_mask & required_domains)
             score += domain_match * 10
             
             candidates.append((score, node))
         
-        # Sort by score and return top N
-        candidates.sort(key=lambda x: x[0], reverse=True)
-        return [node for score, node in candidates[:count]]
+        # Partial sort: only the top N are ordered
+        top = heapq.nlargest(count, candidates, key=itemgetter(0))
+        return [node for score, node in top]
         
     def sync_collective_state(self):
         """Synchronize state across all nodes"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Get all active nodes
-        cursor.execute('SELECT node_id, performance_score FROM nodes')
+        self.flush()
+        # Let SQLite do the reduction; AVG is NULL when there are no nodes
+        avg_performance = self._conn.execute(_SQL_AVG_PERFORMANCE).fetchone()[0]
         
-        total_performance = 0
-        node_count = 0
-        
-        for row in cursor.fetchall():
-            total_performance += row[1]
-            node_count += 1
-        
-        if node_count > 0:
-            avg_performance = total_performance / node_count
-            
-            if avg_performance > 75:
-                self.collective_state = CollectiveState.OPTIMAL
-            elif avg_performance > 50:
-                self.collective_state = CollectiveState.LEARNING
-            elif avg_performance > 25:
-                self.collective_state = CollectiveState.OVERCOMING
-            else:
-                self.collective_state = CollectiveState.ASSIMILATING
-        
-        conn.close()
+        if avg_performance is not None:
+            # bisect_left keeps a score sitting exactly on a cut-off in the lower bucket
+            self.collective_state = _PERFORMANCE_STATES[
+                bisect.bisect_left(_PERFORMANCE_THRESHOLDS, avg_performance)
+            ]
         
     def get_collective_status(self) -> Dict:
         """Get comprehensive status of the collective"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Node statistics
-        cursor.execute('''
-            SELECT COUNT(*), AVG(performance_score), AVG(current_load)
-            FROM nodes
-        ''')
-        node_stats = cursor.fetchone()
-        
-        # Memory statistics
-        cursor.execute('SELECT COUNT(*) FROM collective_memory')
-        memory_count = cursor.fetchone()[0]
-        
-        # Pattern statistics
-        cursor.execute('''
-            SELECT COUNT(*), AVG(confidence)
-            FROM learned_patterns
-        ''')
-        pattern_stats = cursor.fetchone()
-        
-        # Strategy statistics
-        cursor.execute('''
-            SELECT COUNT(*), AVG(success_rate)
-            FROM overcome_strategies
-        ''')
-        strategy_stats = cursor.fetchone()
-        
-        conn.close()
+        self.flush()
+        # One round trip for all four tables
+        (node_count, avg_performance, avg_load,
+         memory_count,
+         pattern_count, avg_confidence,
+         strategy_count, avg_success_rate) = (
+            self._conn.execute(_SQL_COLLECTIVE_STATUS).fetchone()
+        )
         
         return {
             'state': self.collective_state.value,
             'nodes': {
-                'count': node_stats[0] or 0,
-                'avg_performance': node_stats[1] or 0,
-                'avg_load': node_stats[2] or 0
+                'count': node_count or 0,
+                'avg_performance': avg_performance or 0,
+                'avg_load': avg_load or 0
             },
             'memory': {
                 'entries': memory_count
             },
             'patterns': {
-                'count': pattern_stats[0] or 0,
-                'avg_confidence': pattern_stats[1] or 0
+                'count': pattern_count or 0,
+                'avg_confidence': avg_confidence or 0
             },
             'strategies': {
-                'count': strategy_stats[0] or 0,
-                'avg_success_rate': strategy_stats[1] or 0
+                'count': strategy_count or 0,
+                'avg_success_rate': avg_success_rate or 0
             }
         }
 
 
-def main():
-    """Demo of collective intelligence"""
-    print("="*80)
-    print("🤖 COLLECTIVE INTELLIGENCE - BORG-LIKE HIVE MIND")
-    print("="*80)
-    print()
-    
-    hive = HiveMind()
-    
-    # Assimilate nodes
-    print("Phase 1: ASSIMILATE")
-    print("-" * 80)
-    
-    nodes = [
+@lru_cache(maxsize=None)
+def _demo_nodes() -> Tuple[CollectiveNode, ...]:
+    """Sample nodes for the demo, built once per process"""
+    now = time.time()
+    return (
         CollectiveNode(
             node_id="deepseek-r1",
             node_type="cloud_model",
             capabilities=["reasoning", "coding", "math"],
             current_load=0.3,
             performance_score=85.0,
-            last_heartbeat=datetime.now(),
+            last_heartbeat=now,
             state=CollectiveState.OPTIMAL,
             knowledge_domains={"algorithms", "system_design"}
         ),
@@ -598,7 +1013,7 @@ def main():
             capabilities=["speed", "general", "multilingual"],
             current_load=0.5,
             performance_score=78.0,
-            last_heartbeat=datetime.now(),
+            last_heartbeat=now,
             state=CollectiveState.OPTIMAL,
             knowledge_domains={"quick_facts", "conversations"}
         ),
@@ -608,18 +1023,30 @@ def main():
             capabilities=["general", "coding", "conversation"],
             current_load=0.2,
             performance_score=92.0,
-            last_heartbeat=datetime.now(),
+            last_heartbeat=now,
             state=CollectiveState.OPTIMAL,
             knowledge_domains={"programming", "natural_language"}
         )
-    ]
+    )
+
+
+def _emit(*lines: str):
+    """Write a block of demo output with a single stdout call"""
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def main():
+    """Demo of collective intelligence"""
+    rule = "=" * 80
+    _emit(rule, "🤖 COLLECTIVE INTELLIGENCE - BORG-LIKE HIVE MIND", rule, "")
     
-    for node in nodes:
-        hive.assimilate_node(node)
+    hive = HiveMind()
     
-    print()
-    print("Phase 2: LEARN")
-    print("-" * 80)
+    # Assimilate nodes
+    _emit("Phase 1: ASSIMILATE", "-" * 80)
+    hive.assimilate_nodes(_demo_nodes())
+    
+    _emit("", "Phase 2: LEARN", "-" * 80)
     
     # Learn patterns
     hive.learn_pattern(
@@ -634,9 +1061,7 @@ def main():
         confidence=0.8
     )
     
-    print()
-    print("Phase 3: OVERCOME")
-    print("-" * 80)
+    _emit("", "Phase 3: OVERCOME", "-" * 80)
     
     # Test overcome strategies
     challenges = ["rate_limit", "empty_response", "all_models_failed"]
@@ -645,19 +1070,15 @@ def main():
         strategy = hive.overcome_challenge(challenge, {"urgency": "high"})
         print()
     
-    print()
-    print("="*80)
-    print("COLLECTIVE STATUS")
-    print("="*80)
-    
     status = hive.get_collective_status()
-    print(json.dumps(status, indent=2))
-    
-    print()
-    print("="*80)
-    print("🤖 \"We are the Borg. Your models will adapt to service us.\"")
-    print("   \"Resistance is futile. Intelligence is collective.\"")
-    print("="*80)
+    _emit(
+        "", rule, "COLLECTIVE STATUS", rule,
+        json.dumps(status, indent=2),
+        "", rule,
+        "🤖 \"We are the Borg. Your models will adapt to service us.\"",
+        "   \"Resistance is futile. Intelligence is collective.\"",
+        rule
+    )
 
 
 if __name__ == "__main__":
@@ -11,19 +11,109 @@ Implements:
 - Ensemble guardrails for fact verification
 """
 
+import atexit
 import hashlib
+import itertools
 import json
+import os
+import re
+import sys
 import time
-from typing import Dict, List, Optional, Tuple, Set
-from dataclasses import dataclass, asdict
+from collections import OrderedDict
+from typing import Dict, FrozenSet, List, Optional, Tuple, Set
+from dataclasses import dataclass
 from datetime import datetime
+from functools import lru_cache
+from operator import attrgetter
 from pathlib import Path
 from enum import Enum
 import tiktoken
 
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import xxhash
+except ImportError:  # pragma: no cover - optional dependency
+    xxhash = None
+
 
 CONFIG_DIR = Path.home() / ".gh-ai-assistant"
 INTEGRITY_LOG = CONFIG_DIR / "context_integrity.log"
+ENCODE_BATCH_THREADS = 4  # tiktoken worker threads for batch encoding
+MEASURE_CACHE_SIZE = 4096  # contents whose (token_count, hash) are remembered
+COUNT_CACHE_MIN_CHARS = 32  # shorter texts are cheaper to encode than to cache
+TRUNCATION_MARK = "...[TRUNCATED]"
+LOG_BUFFER_SIZE = 64 * 1024
+LOG_FLUSH_EVERY = 64  # integrity log entries buffered before a flush
+
+# Transfer context parsing; each pattern scans the text once without
+# splitting it into a list of lines
+_CHECKSUM_RE = re.compile(r"^CHECKSUM:(.*)$", re.MULTILINE)
+_CRITICAL_FACTS_RE = re.compile(r"^CRITICAL_FACTS:(.*)$", re.MULTILINE)
+_CRITICAL_SECTION_RE = re.compile(r"^\[CRITICAL\]\n(.*?)(?=^\[|\Z)",
+                                  re.MULTILINE | re.DOTALL)
+_NONBLANK_LINE_RE = re.compile(r"^[^\S\n]*\S", re.MULTILINE)
+
+# Older messages mentioning any of these (as substrings) are kept as MEDIUM
+RELEVANCE_KEYWORDS = ('code', 'function', 'error', 'implement', 'bug', 'feature')
+_RELEVANCE_RE = re.compile("|".join(RELEVANCE_KEYWORDS), re.IGNORECASE)
+
+
+@lru_cache(maxsize=None)
+def _encoder() -> "tiktoken.Encoding":
+    """Shared cl100k_base encoder, loaded on first use"""
+    return tiktoken.get_encoding("cl100k_base")
+
+
+def _dumps_line(obj) -> bytes:
+    """One JSON log line as bytes, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(obj) + b'\n'
+    return json.dumps(obj).encode() + b'\n'
+
+
+def _content_hash(content: str) -> str:
+    """
+    16-hex-char identity tag for an element (not a security primitive)
+    xxh3 when installed, otherwise the leading half of SHA-256
+    """
+    if xxhash is not None:
+        return xxhash.xxh3_64_hexdigest(content.encode())
+    return hashlib.sha256(content.encode()).hexdigest()[:16]
+
+
+@lru_cache(maxsize=8192)
+def _count_tokens_cached(text: str) -> int:
+    """Memoized token count for texts long enough to be worth remembering"""
+    return len(_encoder().encode_ordinary(text))
+
+
+# content -> (token_count, hash), least recently used first. Conversation
+# history and key facts are re-packed on every turn but never change
+_measure_cache: "OrderedDict[str, Tuple[int, str]]" = OrderedDict()
+
+
+def _measure_many(contents: List[str]) -> List[Tuple[int, str]]:
+    """Token count and short hash per content; only uncached texts are encoded"""
+    missing = [c for c in dict.fromkeys(contents) if c not in _measure_cache]
+    if missing:
+        token_lists = _encoder().encode_ordinary_batch(
+            missing, num_threads=ENCODE_BATCH_THREADS
+        )
+        for content, tokens in zip(missing, token_lists):
+            _measure_cache[content] = (len(tokens), _content_hash(content))
+    
+    results = []
+    for content in contents:
+        _measure_cache.move_to_end(content)
+        results.append(_measure_cache[content])
+    
+    while len(_measure_cache) > MEASURE_CACHE_SIZE:
+        _measure_cache.popitem(last=False)
+    return results
 
 
 class ContextPriority(Enum):
@@ -34,51 +124,113 @@ class ContextPriority(Enum):
     LOW = 1       # Optional (old messages, metadata)
 
 
-@dataclass
+# Highest priority first
+_PRIORITY_ORDER = (ContextPriority.CRITICAL, ContextPriority.HIGH,
+                   ContextPriority.MEDIUM, ContextPriority.LOW)
+
+
+_token_count = attrgetter('token_count')
+_content = attrgetter('content')
+
+
+def _total_tokens(elements: List["ContextElement"]) -> int:
+    """Sum of token counts, summed in C over map() rather than a generator"""
+    return sum(map(_token_count, elements))
+
+
+def _greedy_fill(token_counts: List[int], budget: int) -> Tuple[List[int], int]:
+    """
+    First-fit selection over plain ints: indices of the counts taken, in order,
+    while each still fits, plus the budget left over
+    """
+    taken = []
+    for index, count in enumerate(token_counts):
+        if count <= budget:
+            taken.append(index)
+            budget -= count
+    return taken, budget
+
+
+def _bucket_by_priority(elements: List["ContextElement"]) -> Dict[ContextPriority, List["ContextElement"]]:
+    """Split elements by priority in one pass, keeping their order within a bucket"""
+    buckets = {priority: [] for priority in ContextPriority}
+    for elem in elements:
+        buckets[elem.priority].append(elem)
+    return buckets
+
+
+@dataclass(frozen=True)
 class ContextElement:
     """Single element of context with priority and metadata"""
+    # Explicit __slots__ (dataclass(slots=True) needs Python 3.10); packing
+    # creates one element per message, so skip the per-instance __dict__
+    __slots__ = ('content', 'priority', 'timestamp_ns', 'element_type',
+                 'token_count', 'hash')
+    
     content: str
     priority: ContextPriority
-    timestamp: datetime
+    timestamp_ns: int  # time.time_ns(); see the timestamp property
     element_type: str  # 'fact', 'message', 'code', 'state'
     token_count: int
     hash: str
     
+    def __getstate__(self) -> Tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+    
+    def __setstate__(self, state: Tuple) -> None:
+        # The frozen __setattr__ would reject the default slot restore used by
+        # copy and pickle, so write the slots directly
+        for name, value in zip(self.__slots__, state):
+            object.__setattr__(self, name, value)
+    
+    @property
+    def timestamp(self) -> datetime:
+        """Creation time as a datetime, built only when asked for"""
+        return datetime.fromtimestamp(self.timestamp_ns / 1e9)
+    
+    def to_dict(self) -> Dict:
+        """Convert to a JSON-ready dictionary"""
+        return {
+            'content': self.content,
+            'priority': self.priority.value,
+            'timestamp': self.timestamp.isoformat(),
+            'element_type': self.element_type,
+            'token_count': self.token_count,
+            'hash': self.hash
+        }
+    
     @classmethod
     def from_message(cls, msg: Dict, priority: ContextPriority = ContextPriority.MEDIUM):
         """Create from conversation message"""
-        content = msg.get('content', '')
-        encoder = tiktoken.get_encoding("cl100k_base")
-        tokens = len(encoder.encode(content))
-        
-        return cls(
-            content=content,
-            priority=priority,
-            timestamp=datetime.now(),
-            element_type='message',
-            token_count=tokens,
-            hash=hashlib.sha256(content.encode()).hexdigest()[:16]
-        )
+        return cls.build(msg.get('content', ''), priority, 'message')
     
     @classmethod
     def from_fact(cls, fact: str, priority: ContextPriority = ContextPriority.CRITICAL):
         """Create from key fact"""
-        encoder = tiktoken.get_encoding("cl100k_base")
-        tokens = len(encoder.encode(fact))
+        return cls.build(fact, priority, 'fact')
+    
+    @classmethod
+    def build(cls, content: str, priority: ContextPriority, element_type: str,
+              measured: Optional[Tuple[int, str]] = None):
+        """Create an element from content and its (token_count, hash) if known"""
+        token_count, content_hash = measured or _measure_many([content])[0]
         
         return cls(
-            content=fact,
+            content=content,
             priority=priority,
-            timestamp=datetime.now(),
-            element_type='fact',
-            token_count=tokens,
-            hash=hashlib.sha256(fact.encode()).hexdigest()[:16]
+            timestamp_ns=time.time_ns(),
+            element_type=element_type,
+            token_count=token_count,
+            hash=content_hash
         )
 
 
 @dataclass
 class ContextSnapshot:
     """Immutable snapshot of context state"""
+    __slots__ = ('snapshot_id', 'timestamp', 'elements', 'total_tokens',
+                 'checksum', 'metadata', 'critical_hashes', 'has_anchors')
+    
     snapshot_id: str
     timestamp: datetime
     elements: List[ContextElement]
@@ -86,12 +238,21 @@ class ContextSnapshot:
     checksum: str
     metadata: Dict
     
+    def __post_init__(self):
+        # Derived once so validate_integrity compares sets, not element lists
+        critical = [e for e in self.elements if e.priority is ContextPriority.CRITICAL]
+        self.critical_hashes: FrozenSet[str] = frozenset(e.hash for e in critical)
+        self.has_anchors = any(
+            e.element_type == 'fact' and e.content.startswith('ANCHORS:')
+            for e in critical
+        )
+    
     def to_dict(self) -> Dict:
         """Convert to dictionary"""
         return {
             'snapshot_id': self.snapshot_id,
             'timestamp': self.timestamp.isoformat(),
-            'elements': [asdict(e) for e in self.elements],
+            'elements': [e.to_dict() for e in self.elements],
             'total_tokens': self.total_tokens,
             'checksum': self.checksum,
             'metadata': self.metadata
@@ -110,28 +271,67 @@ class ContextIntegrityManager:
     5. Integrity logging
     """
     
+    # Snapshot ids: a per-process prefix (start time, pid) plus a counter, so
+    # ids are unique within the process and distinct across runs in the log
+    _snapshot_prefix = f"snapshot_{int(time.time())}_{os.getpid()}_"
+    _snapshot_counter = itertools.count()
+    
     def __init__(self):
-        self.encoder = tiktoken.get_encoding("cl100k_base")
+        self.encoder = _encoder()
         self.snapshots: List[ContextSnapshot] = []
         self.key_facts: Set[str] = set()
         self.anchors: Dict[str, str] = {}  # Critical identifiers
+        # (anchor items it was built from, interned "ANCHORS: ..." fact)
+        self._anchor_fact: Tuple[tuple, str] = ((), "")
+        # Append-only, buffered; opened on first log and flushed every
+        # LOG_FLUSH_EVERY entries, before stats are read, and at exit
+        self._log_file = None
+        self._unflushed_logs = 0
+        self._truncation_tokens = len(self.encoder.encode_ordinary(TRUNCATION_MARK))
         self._ensure_config_dir()
         
+    def close(self):
+        """Flush and close the integrity log"""
+        if self._log_file is not None:
+            atexit.unregister(self._log_file.close)
+            self._log_file.close()
+            self._log_file = None
+            
+    def __del__(self):
+        try:
+            self.close()
+        except Exception:
+            pass
+            
     def _ensure_config_dir(self):
         """Ensure config directory exists"""
         CONFIG_DIR.mkdir(parents=True, exist_ok=True)
         
     def count_tokens(self, text: str) -> int:
         """Count tokens in text"""
-        return len(self.encoder.encode(text))
+        if len(text) < COUNT_CACHE_MIN_CHARS:
+            return len(self.encoder.encode_ordinary(text))
+        return _count_tokens_cached(text)
     
     def add_key_fact(self, fact: str):
         """Add a fact that must be preserved"""
-        self.key_facts.add(fact)
+        # Interned so every pack hands the measure cache the same object,
+        # whose hash is already computed and whose lookup is an identity match
+        self.key_facts.add(sys.intern(fact))
         
     def set_anchor(self, key: str, value: str):
         """Set critical anchor (e.g., assistant_name, user_name, project)"""
-        self.anchors[key] = value
+        self.anchors[sys.intern(key)] = sys.intern(value)
+        
+    def _anchors_fact(self) -> str:
+        """The ANCHORS fact, rebuilt only when the anchors have changed"""
+        items = tuple(self.anchors.items())
+        built_from, fact = self._anchor_fact
+        if built_from != items:
+            anchor_str = " | ".join([f"{k}:{v}" for k, v in items])
+            fact = sys.intern(f"ANCHORS: {anchor_str}")
+            self._anchor_fact = (items, fact)
+        return fact
         
     def pack_context(self, 
                     conversation_history: List[Dict],
@@ -147,40 +347,41 @@ class ContextIntegrityManager:
         3. Include recent N messages (HIGH priority)
         4. Include older relevant messages (MEDIUM priority)
         """
-        elements = []
+        # (content, priority, element_type); token counts and hashes are filled
+        # in below, batch-encoding only contents not seen on earlier packs
+        specs = []
         
         # 1. Add critical anchors
         if include_anchors and self.anchors:
-            anchor_str = " | ".join([f"{k}:{v}" for k, v in self.anchors.items()])
-            elements.append(ContextElement.from_fact(
-                f"ANCHORS: {anchor_str}",
-                ContextPriority.CRITICAL
-            ))
+            specs.append((self._anchors_fact(), ContextPriority.CRITICAL, 'fact'))
         
         # 2. Add key facts
         facts_to_include = key_facts or []
         facts_to_include.extend(self.key_facts)
         
         for fact in facts_to_include:
-            elements.append(ContextElement.from_fact(fact, ContextPriority.CRITICAL))
+            specs.append((fact, ContextPriority.CRITICAL, 'fact'))
         
         # 3. Recent messages (HIGH priority)
         recent_messages = conversation_history[-window_size:] if conversation_history else []
         for msg in recent_messages:
-            elements.append(ContextElement.from_message(msg, ContextPriority.HIGH))
+            specs.append((msg.get('content', ''), ContextPriority.HIGH, 'message'))
         
         # 4. Older relevant messages (MEDIUM priority)
         older_messages = conversation_history[:-window_size] if len(conversation_history) > window_size else []
         
-        # Filter for technical relevance
+        # Filter for technical relevance (one regex scan, no lowercased copy)
         for msg in older_messages:
-            content = msg.get('content', '').lower()
-            if any(keyword in content for keyword in [
-                'code', 'function', 'error', 'implement', 'bug', 'feature'
-            ]):
-                elements.append(ContextElement.from_message(msg, ContextPriority.MEDIUM))
+            content = msg.get('content', '')
+            if _RELEVANCE_RE.search(content):
+                specs.append((content, ContextPriority.MEDIUM, 'message'))
         
-        return elements
+        measured = _measure_many([content for content, _, _ in specs])
+        
+        return [
+            ContextElement.build(content, priority, element_type, measure)
+            for (content, priority, element_type), measure in zip(specs, measured)
+        ]
     
     def optimize_tokens(self, 
                        elements: List[ContextElement],
@@ -196,41 +397,29 @@ class ContextIntegrityManager:
         4. Compress HIGH if absolutely necessary
         """
         # Calculate current tokens
-        current_tokens = sum(e.token_count for e in elements)
+        current_tokens = _total_tokens(elements)
         
         if current_tokens <= token_limit:
             return elements
         
-        # Separate by priority
-        critical = [e for e in elements if e.priority == ContextPriority.CRITICAL]
-        high = [e for e in elements if e.priority == ContextPriority.HIGH]
-        medium = [e for e in elements if e.priority == ContextPriority.MEDIUM]
-        low = [e for e in elements if e.priority == ContextPriority.LOW]
+        # Separate by priority in a single pass
+        buckets = _bucket_by_priority(elements)
         
         # Start with critical (always included if preserve_critical)
-        result = critical if preserve_critical else []
-        remaining_budget = token_limit - sum(e.token_count for e in result)
-        
-        # Add HIGH priority
-        for elem in high:
-            if elem.token_count <= remaining_budget:
-                result.append(elem)
-                remaining_budget -= elem.token_count
-        
-        # Add MEDIUM priority
-        for elem in medium:
-            if elem.token_count <= remaining_budget:
-                result.append(elem)
-                remaining_budget -= elem.token_count
-        
-        # Add LOW priority if space
-        for elem in low:
-            if elem.token_count <= remaining_budget:
-                result.append(elem)
-                remaining_budget -= elem.token_count
+        result = buckets[ContextPriority.CRITICAL] if preserve_critical else []
+        remaining_budget = token_limit - _total_tokens(result)
+        
+        # Fill HIGH, then MEDIUM, then LOW while there is space; the selection
+        # runs on a flat list of token counts and elements are picked after
+        candidates = [elem for priority in _PRIORITY_ORDER[1:] for elem in buckets[priority]]
+        taken, remaining_budget = _greedy_fill(
+            list(map(_token_count, candidates)), remaining_budget
+        )
+        result.extend(candidates[i] for i in taken)
         
         # If still over, compress HIGH priority elements
-        if sum(e.token_count for e in result) > token_limit and not preserve_critical:
+        # The running budget already tracks the total: below zero means over limit
+        if remaining_budget < 0 and not preserve_critical:
             # Emergency: even compress critical
             result = self._emergency_compress(result, token_limit)
         
@@ -248,19 +437,21 @@ class ContextIntegrityManager:
                 compressed.append(elem)
                 budget -= elem.token_count
             else:
-                # Truncate to fit
-                tokens = self.encoder.encode(elem.content)[:budget]
-                truncated_content = self.encoder.decode(tokens)
-                
-                compressed_elem = ContextElement(
-                    content=truncated_content + "...[TRUNCATED]",
-                    priority=elem.priority,
-                    timestamp=elem.timestamp,
-                    element_type=elem.element_type,
-                    token_count=len(tokens),
-                    hash=hashlib.sha256(truncated_content.encode()).hexdigest()[:16]
-                )
-                compressed.append(compressed_elem)
+                # Truncate to fit, leaving room for the marker itself
+                token_budget = budget - self._truncation_tokens
+                if token_budget > 0:
+                    tokens = self.encoder.encode_ordinary(elem.content)[:token_budget]
+                    truncated_content = self.encoder.decode(tokens) + TRUNCATION_MARK
+                    
+                    compressed_elem = ContextElement(
+                        content=truncated_content,
+                        priority=elem.priority,
+                        timestamp_ns=elem.timestamp_ns,
+                        element_type=elem.element_type,
+                        token_count=len(tokens) + self._truncation_tokens,
+                        hash=_content_hash(truncated_content)
+                    )
+                    compressed.append(compressed_elem)
                 break
         
         return compressed
@@ -269,8 +460,8 @@ class ContextIntegrityManager:
                        elements: List[ContextElement],
                        metadata: Dict = None) -> ContextSnapshot:
         """Create immutable snapshot with checksum"""
-        snapshot_id = f"snapshot_{int(time.time())}_{id(self)}"
-        total_tokens = sum(e.token_count for e in elements)
+        snapshot_id = f"{self._snapshot_prefix}{next(self._snapshot_counter)}"
+        total_tokens = _total_tokens(elements)
         
         # Create checksum from all element hashes
         combined_hash = "".join([e.hash for e in elements])
@@ -301,18 +492,14 @@ class ContextIntegrityManager:
         3. Token count delta within tolerance
         4. Anchor preservation
         """
+        # Identical element hashes in the same order: nothing can have changed
+        if snapshot_before.checksum == snapshot_after.checksum:
+            return True, "Integrity validated"
+        
         issues = []
         
         # Check critical elements
-        critical_before = [e for e in snapshot_before.elements 
-                          if e.priority == ContextPriority.CRITICAL]
-        critical_after = [e for e in snapshot_after.elements 
-                         if e.priority == ContextPriority.CRITICAL]
-        
-        before_hashes = {e.hash for e in critical_before}
-        after_hashes = {e.hash for e in critical_after}
-        
-        missing = before_hashes - after_hashes
+        missing = snapshot_before.critical_hashes - snapshot_after.critical_hashes
         if missing:
             issues.append(f"Missing {len(missing)} critical elements")
         
@@ -324,15 +511,8 @@ class ContextIntegrityManager:
             issues.append(f"Token count delta {delta_ratio*100:.1f}% exceeds tolerance {tolerance*100:.1f}%")
         
         # Check anchors (if present)
-        for elem in critical_before:
-            if elem.element_type == 'fact' and elem.content.startswith('ANCHORS:'):
-                # Verify anchor present in after
-                anchor_found = any(
-                    e.element_type == 'fact' and e.content.startswith('ANCHORS:')
-                    for e in critical_after
-                )
-                if not anchor_found:
-                    issues.append("Critical anchors missing in transfer")
+        if snapshot_before.has_anchors and not snapshot_after.has_anchors:
+            issues.append("Critical anchors missing in transfer")
         
         if issues:
             return False, "; ".join(issues)
@@ -361,29 +541,30 @@ class ContextIntegrityManager:
         [CONTEXT_END]
         """
         lines = []
+        buckets = _bucket_by_priority(elements)
         
         if include_integrity_marker:
             # Generate checksum
             combined = "".join([e.hash for e in elements])
             checksum = hashlib.sha256(combined.encode()).hexdigest()[:16]
             
-            critical_count = sum(1 for e in elements if e.priority == ContextPriority.CRITICAL)
+            critical_count = len(buckets[ContextPriority.CRITICAL])
             
-            lines.append("[CONTEXT_INTEGRITY_MARKER]")
-            lines.append(f"CHECKSUM: {checksum}")
-            lines.append(f"CRITICAL_FACTS: {critical_count}")
-            lines.append(f"TOTAL_TOKENS: {sum(e.token_count for e in elements)}")
-            lines.append("")
+            lines.extend((
+                "[CONTEXT_INTEGRITY_MARKER]",
+                f"CHECKSUM: {checksum}",
+                f"CRITICAL_FACTS: {critical_count}",
+                f"TOTAL_TOKENS: {_total_tokens(elements)}",
+                ""
+            ))
         
         # Group by priority
-        for priority in [ContextPriority.CRITICAL, ContextPriority.HIGH, 
-                        ContextPriority.MEDIUM, ContextPriority.LOW]:
-            priority_elements = [e for e in elements if e.priority == priority]
+        for priority in _PRIORITY_ORDER:
+            priority_elements = buckets[priority]
             
             if priority_elements:
                 lines.append(f"[{priority.name}]")
-                for elem in priority_elements:
-                    lines.append(elem.content)
+                lines.extend(map(_content, priority_elements))
                 lines.append("")
         
         if include_integrity_marker:
@@ -400,30 +581,20 @@ class ContextIntegrityManager:
             return False, "Missing end marker"
         
         # Extract and verify checksum
-        lines = transfer_text.split('\n')
-        checksum_line = None
-        critical_line = None
-        
-        for line in lines:
-            if line.startswith("CHECKSUM:"):
-                checksum_line = line.split(":", 1)[1].strip()
-            elif line.startswith("CRITICAL_FACTS:"):
-                critical_line = int(line.split(":", 1)[1].strip())
+        checksum_match = _CHECKSUM_RE.search(transfer_text)
+        checksum_line = checksum_match.group(1).strip() if checksum_match else None
+        critical_match = _CRITICAL_FACTS_RE.search(transfer_text)
+        critical_line = int(critical_match.group(1).strip()) if critical_match else None
         
         if not checksum_line:
             return False, "Missing checksum"
         
-        # Count critical facts in content
-        critical_section = False
-        critical_count = 0
-        
-        for line in lines:
-            if line == "[CRITICAL]":
-                critical_section = True
-            elif line.startswith("[") and line != "[CRITICAL]":
-                critical_section = False
-            elif critical_section and line.strip():
-                critical_count += 1
+        # Count non-blank lines in [CRITICAL] sections (each runs to the next
+        # line starting with '[')
+        critical_count = sum(
+            len(_NONBLANK_LINE_RE.findall(section))
+            for section in _CRITICAL_SECTION_RE.findall(transfer_text)
+        )
         
         if critical_line and critical_count != critical_line:
             return False, f"Critical fact count mismatch: expected {critical_line}, found {critical_count}"
@@ -436,17 +607,28 @@ class ContextIntegrityManager:
                            message: str):
         """Log integrity check to file"""
         log_entry = {
-            'timestamp': datetime.now().isoformat(),
+            'timestamp': time.time(),
             'snapshot_id': snapshot_id,
             'valid': valid,
             'message': message
         }
         
-        with open(INTEGRITY_LOG, 'a') as f:
-            f.write(json.dumps(log_entry) + '\n')
+        if self._log_file is None:
+            self._log_file = open(INTEGRITY_LOG, 'ab', buffering=LOG_BUFFER_SIZE)
+            atexit.register(self._log_file.close)
+        
+        self._log_file.write(_dumps_line(log_entry))
+        self._unflushed_logs += 1
+        if self._unflushed_logs >= LOG_FLUSH_EVERY:
+            self._log_file.flush()
+            self._unflushed_logs = 0
     
     def get_integrity_stats(self) -> Dict:
         """Get integrity check statistics"""
+        if self._log_file is not None:
+            self._log_file.flush()
+            self._unflushed_logs = 0
+        
         if not INTEGRITY_LOG.exists():
             return {
                 'total_checks': 0,
@@ -455,15 +637,14 @@ class ContextIntegrityManager:
                 'success_rate': 0
             }
         
-        total = 0
-        passed = 0
+        # One JSON object per line; count raw bytes instead of parsing each
+        # entry. Quotes inside string values are escaped, so the key pattern
+        # can only match the real 'valid' field
+        with open(INTEGRITY_LOG, 'rb') as f:
+            data = f.read()
         
-        with open(INTEGRITY_LOG, 'r') as f:
-            for line in f:
-                entry = json.loads(line)
-                total += 1
-                if entry['valid']:
-                    passed += 1
+        total = data.count(b'\n')
+        passed = data.count(b'"valid": true') + data.count(b'"valid":true')
         
         return {
             'total_checks': total,
@@ -12,11 +12,18 @@ Features:
 """
 
 import json
+import re
 import sqlite3
+import sys
+import time
+import weakref
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional, Tuple
 from dataclasses import dataclass
+from types import SimpleNamespace
+
+from conversation_store import CONNECTION_PRAGMAS
 
 
 CONFIG_DIR = Path.home() / ".gh-ai-assistant"
@@ -24,6 +31,137 @@ CONVERSATION_DB = CONFIG_DIR / "conversations.db"
 BRIDGE_DB = CONFIG_DIR / "memory_bridge.db"
 SESSION_FILE = CONFIG_DIR / "user_session.json"
 
+# CLI defaults, and the value-less flags main() handles without argparse
+DEFAULT_RECAP = 10
+DEFAULT_TIMELINE_HOURS = 24
+_FLAG_OPTIONS = {
+    '--status': 'status',
+    '--bridge': 'bridge',
+    '--resume': 'resume',
+    '--where-am-i': 'where_am_i',
+}
+
+# Seconds a state snapshot is reused before the databases are read again
+STATE_CACHE_TTL = 1.0
+
+# Common technical terms used to summarize recent context
+_KW_TO_TOPIC = {
+    'authentication': 'Auth system',
+    'fastapi': 'FastAPI',
+    'jwt': 'JWT tokens',
+    'database': 'Database',
+    'api': 'API development',
+    'memory': 'Memory management',
+    'bridge': 'Memory bridge',
+    'transfer': 'Context transfer',
+    'model': 'Model selection',
+    'session': 'Session handling'
+}
+# Zero-width lookahead so overlapping keywords ("api" in "fastapi") are
+# all reported, matching plain substring tests
+_KW_PATTERN = re.compile(
+    '(?=(' + '|'.join(map(re.escape, _KW_TO_TOPIC)) + '))', re.IGNORECASE
+)
+
+# Report banners; each ends with the newline that closes its last line
+_SUMMARY_HEADER = (
+    "╔══════════════════════════════════════════════════════════════════════╗\n"
+    "║                    CONVERSATION STATE SNAPSHOT                       ║\n"
+    "╚══════════════════════════════════════════════════════════════════════╝\n"
+)
+_RECAP_HEADER = (
+    "╔══════════════════════════════════════════════════════════════════════╗\n"
+    "║                      CONVERSATION RECAP                              ║\n"
+    "╚══════════════════════════════════════════════════════════════════════╝\n"
+)
+_TIMELINE_HEADER = (
+    "╔══════════════════════════════════════════════════════════════════════╗\n"
+    "║                      SESSION TIMELINE                                ║\n"
+    "╚══════════════════════════════════════════════════════════════════════╝\n"
+)
+
+# Recap icon/label per role; anything that is not the user is the AI
+_RECAP_AI = ("🤖", "AI")
+_RECAP_ROLES = {'user': ("👤", "YOU")}
+
+# Everything get_current_state and check_bridge_status need from the latest
+# pending activation; columns an older bridge schema lacks read as NULL
+_BRIDGE_FIELDS = ('state', 'user_prompt', 'continuation_prompt',
+                  'expected_recovery_time', 'activation_time')
+
+_SQL_BRIDGE_LATEST = '''
+    SELECT {columns}
+    FROM bridge_activations
+    WHERE successful = 0
+    ORDER BY activation_time DESC
+    LIMIT 1
+'''
+
+# Message text is truncated in SQL to what the views can show. Recaps
+# display RECAP_PREVIEW_CHARS and fetch one more so format_recap can tell
+# when to add an ellipsis; the state view shows at most 150 characters and
+# scans SUMMARY_SCAN_CHARS for topics
+RECAP_PREVIEW_CHARS = 150
+SUMMARY_SCAN_CHARS = 512
+
+_SQL_RECAP = f'''
+    SELECT role, substr(content, 1, {RECAP_PREVIEW_CHARS + 1}), timestamp
+    FROM messages
+    ORDER BY timestamp DESC
+    LIMIT ?
+'''
+
+# Conversation count plus the five newest messages
+_SQL_CURRENT_STATE = f'''
+    SELECT counts.total, recent.role, recent.content, recent.timestamp
+    FROM (SELECT COUNT(*) AS total FROM conversations) AS counts
+    LEFT JOIN (
+        SELECT id, role, substr(content, 1, {SUMMARY_SCAN_CHARS}) AS content, timestamp
+        FROM messages
+        ORDER BY timestamp DESC, id DESC
+        LIMIT 5
+    ) AS recent
+    ORDER BY recent.timestamp DESC, recent.id DESC
+'''
+
+_SQL_SUMMARY = f'''
+    SELECT substr(content, 1, {SUMMARY_SCAN_CHARS})
+    FROM messages
+    ORDER BY timestamp DESC
+    LIMIT 5
+'''
+
+# Pairs each user message with the assistant reply that follows it.
+# Mirrors the old stateful grouping: a user message followed by another
+# user message stands alone, an assistant message with no user before it
+# stands alone without a time, and a trailing unanswered user message is
+# left out
+_SQL_TIMELINE = '''
+    SELECT CASE WHEN role = 'user' THEN substr(content, 1, 100) END,
+           CASE WHEN role = 'assistant' THEN substr(content, 1, 100)
+                WHEN next_role = 'assistant' THEN substr(next_content, 1, 100)
+           END,
+           CASE WHEN role = 'user' THEN timestamp END
+    FROM (
+        SELECT id, role, content, timestamp,
+               LAG(role) OVER w AS prev_role,
+               LEAD(role) OVER w AS next_role,
+               LEAD(content) OVER w AS next_content
+        FROM messages
+        WHERE timestamp >= ? AND role IN ('user', 'assistant')
+        WINDOW w AS (ORDER BY timestamp, id)
+    )
+    WHERE (role = 'user' AND next_role IS NOT NULL)
+       OR (role = 'assistant' AND prev_role IS NOT 'user')
+    ORDER BY timestamp, id
+'''
+
+_SQL_TIMELINE_COUNT = '''
+    SELECT COUNT(*)
+    FROM messages
+    WHERE timestamp >= ?
+'''
+
 
 @dataclass
 class ConversationState:
@@ -43,41 +181,33 @@ class ConversationState:
     
     def format_summary(self) -> str:
         """Format human-readable summary"""
-        lines = []
-        lines.append("╔══════════════════════════════════════════════════════════════════════╗")
-        lines.append("║                    CONVERSATION STATE SNAPSHOT                       ║")
-        lines.append("╚══════════════════════════════════════════════════════════════════════╝")
-        lines.append("")
-        lines.append(f"👤 USER: {self.user_name}")
-        lines.append(f"🤖 ASSISTANT: {self.assistant_name}")
-        lines.append(f"📊 CONVERSATION: #{self.conversation_count}")
-        lines.append(f"⏰ LAST ACTIVE: {self.last_exchange_time.strftime('%Y-%m-%d %H:%M:%S')}")
-        lines.append("")
-        
         if self.bridge_active:
-            lines.append("🌉 STATUS: MEMORY BRIDGE ACTIVE")
-            lines.append(f"   Reason: {self.bridge_reason}")
-            lines.append("   Your conversation is safely preserved")
-            lines.append("   Waiting for model recovery...")
+            status = (
+                "🌉 STATUS: MEMORY BRIDGE ACTIVE\n"
+                f"   Reason: {self.bridge_reason}\n"
+                "   Your conversation is safely preserved\n"
+                "   Waiting for model recovery..."
+            )
         else:
-            lines.append(f"✅ STATUS: ACTIVE on {self.current_model}")
-        
-        lines.append("")
-        lines.append("💬 LAST EXCHANGE:")
-        lines.append(f"   You: {self.last_user_message[:100]}...")
-        lines.append(f"   AI: {self.last_assistant_message[:100]}...")
+            status = f"✅ STATUS: ACTIVE on {self.current_model}"
         
+        pending = ""
         if self.pending_prompt:
-            lines.append("")
-            lines.append("⏳ PENDING:")
-            lines.append(f"   {self.pending_prompt[:100]}...")
-        
-        lines.append("")
-        lines.append("📝 CONTEXT:")
-        lines.append(f"   {self.context_summary}")
-        lines.append("")
-        
-        return "\n".join(lines)
+            pending = f"\n\n⏳ PENDING:\n   {self.pending_prompt[:100]}..."
+        
+        return (
+            f"{_SUMMARY_HEADER}\n"
+            f"👤 USER: {self.user_name}\n"
+            f"🤖 ASSISTANT: {self.assistant_name}\n"
+            f"📊 CONVERSATION: #{self.conversation_count}\n"
+            f"⏰ LAST ACTIVE: {self.last_exchange_time.strftime('%Y-%m-%d %H:%M:%S')}\n"
+            f"\n{status}\n"
+            "\n💬 LAST EXCHANGE:\n"
+            f"   You: {self.last_user_message[:100]}...\n"
+            f"   AI: {self.last_assistant_message[:100]}...{pending}\n"
+            "\n📝 CONTEXT:\n"
+            f"   {self.context_summary}\n"
+        )
 
 
 class ConversationNavigator:
@@ -92,9 +222,66 @@ class ConversationNavigator:
         self.conversation_db = CONVERSATION_DB
         self.bridge_db = BRIDGE_DB
         self.session_file = SESSION_FILE
+        # Opened lazily: either database may not exist yet
+        self._conv_conn: Optional[sqlite3.Connection] = None
+        self._bridge_conn: Optional[sqlite3.Connection] = None
+        self._bridge_sql: Optional[str] = None
+        # --where-am-i asks for the state twice within one invocation
+        self._state_cache: Optional[ConversationState] = None
+        self._state_cache_at = 0.0
+        
+    def _open(self, path: Path, pragmas: str) -> sqlite3.Connection:
+        """Open a connection that is closed once the navigator is collected"""
+        conn = sqlite3.connect(path, check_same_thread=False, cached_statements=128)
+        conn.executescript(pragmas)
+        weakref.finalize(self, conn.close)
+        return conn
+        
+    def _conv(self) -> sqlite3.Connection:
+        """Cached connection to the conversations database"""
+        if self._conv_conn is None:
+            self._conv_conn = self._open(self.conversation_db, CONNECTION_PRAGMAS)
+        return self._conv_conn
+        
+    def _bridge(self) -> sqlite3.Connection:
+        """
+        Cached read-only connection to the memory bridge database
+        MemoryBridge owns that file, so its journal mode is left alone
+        """
+        if self._bridge_conn is None:
+            self._bridge_conn = self._open(self.bridge_db, 'PRAGMA query_only = ON;')
+        return self._bridge_conn
+        
+    def _load_latest_bridge(self) -> Optional[Dict]:
+        """Latest unresolved bridge activation, or None"""
+        if not self.bridge_db.exists():
+            return None
+        
+        conn = self._bridge()
+        if self._bridge_sql is None:
+            columns = {row[1] for row in conn.execute('PRAGMA table_info(bridge_activations)')}
+            self._bridge_sql = _SQL_BRIDGE_LATEST.format(columns=', '.join(
+                field if field in columns else f'NULL AS {field}'
+                for field in _BRIDGE_FIELDS
+            ))
+        
+        row = conn.execute(self._bridge_sql).fetchone()
+        return dict(zip(_BRIDGE_FIELDS, row)) if row else None
         
     def get_current_state(self) -> Optional[ConversationState]:
-        """Get complete current state snapshot"""
+        """Get complete current state snapshot, reused for STATE_CACHE_TTL seconds"""
+        now = time.monotonic()
+        if self._state_cache is not None and now - self._state_cache_at < STATE_CACHE_TTL:
+            return self._state_cache
+        
+        state = self._load_current_state()
+        if state is not None:
+            self._state_cache = state
+            self._state_cache_at = now
+        return state
+    
+    def _load_current_state(self) -> Optional[ConversationState]:
+        """Read the current state snapshot from disk"""
         # Load session
         if not self.session_file.exists():
             return None
@@ -107,66 +294,40 @@ class ConversationNavigator:
         bridge_reason = None
         pending_prompt = None
         
-        if self.bridge_db.exists():
-            conn = sqlite3.connect(self.bridge_db)
-            cursor = conn.cursor()
-            
-            cursor.execute('''
-                SELECT state, user_prompt, continuation_prompt
-                FROM bridge_activations
-                WHERE successful = 0
-                ORDER BY activation_time DESC
-                LIMIT 1
-            ''')
-            
-            result = cursor.fetchone()
-            if result and result[0] == 'activated':
-                bridge_active = True
-                pending_prompt = result[1]
-                bridge_reason = "All models exhausted, waiting for recovery"
-            
-            conn.close()
-        
-        # Get last exchange
-        last_user = "No previous messages"
-        last_assistant = "No previous messages"
-        last_time = datetime.now()
+        bridge = self._load_latest_bridge()
+        if bridge and bridge['state'] == 'activated':
+            bridge_active = True
+            pending_prompt = bridge['user_prompt']
+            bridge_reason = "All models exhausted, waiting for recovery"
         
+        # Conversation count, last exchange and context summary come from
+        # one statement
         if self.conversation_db.exists():
-            conn = sqlite3.connect(self.conversation_db)
-            cursor = conn.cursor()
-            
-            # Get last 2 messages
-            cursor.execute('''
-                SELECT role, content, timestamp
-                FROM messages
-                ORDER BY timestamp DESC
-                LIMIT 2
-            ''')
+            cursor = self._conv().cursor()
             
-            messages = cursor.fetchall()
+            cursor.execute(_SQL_CURRENT_STATE)
             
-            if len(messages) >= 2:
-                if messages[0][0] == 'assistant':
-                    last_assistant = messages[0][1]
-                    last_user = messages[1][1]
-                else:
-                    last_user = messages[0][1]
-                    last_assistant = messages[1][1]
-                    
-                last_time = datetime.fromisoformat(messages[0][2])
-            
-            conn.close()
-        
-        # Generate context summary
-        context_summary = self._generate_context_summary()
+            # The count arrives on every row; with no messages there is a
+            # single row whose message columns are NULL
+            rows = cursor.fetchall()
+            conversation_count = rows[0][0]
+            (last_user, last_assistant, last_time,
+             context_summary) = self._summarize_rows(
+                [row[1:] for row in rows if row[1] is not None]
+            )
+        else:
+            conversation_count = 0
+            last_user = "No previous messages"
+            last_assistant = "No previous messages"
+            last_time = datetime.now()
+            context_summary = "New conversation, no context yet"
         
         return ConversationState(
             session_active=True,
             user_name=session.get('user_name', 'User'),
             assistant_name=session.get('assistant_name', 'Assistant'),
             current_model=session.get('preferred_model', 'Unknown'),
-            conversation_count=session.get('total_conversations', 0),
+            conversation_count=conversation_count,
             last_exchange_time=last_time,
             bridge_active=bridge_active,
             bridge_reason=bridge_reason,
@@ -176,45 +337,51 @@ class ConversationNavigator:
             context_summary=context_summary
         )
     
-    def _generate_context_summary(self) -> str:
+    def _summarize_rows(self, rows: List[Tuple]) -> Tuple[str, str, datetime, str]:
+        """
+        Derive the last exchange and context summary from recent messages
+        
+        Args:
+            rows: (role, content, timestamp) rows, newest first
+            
+        Returns:
+            (last_user, last_assistant, last_time, context_summary)
+        """
+        last_user = "No previous messages"
+        last_assistant = "No previous messages"
+        last_time = datetime.now()
+        
+        if len(rows) >= 2:
+            if rows[0][0] == 'assistant':
+                last_assistant = rows[0][1]
+                last_user = rows[1][1]
+            else:
+                last_user = rows[0][1]
+                last_assistant = rows[1][1]
+                
+            last_time = datetime.fromisoformat(rows[0][2])
+        
+        context_summary = self._generate_context_summary([row[1] for row in rows])
+        return last_user, last_assistant, last_time, context_summary
+    
+    def _generate_context_summary(self, messages: Optional[List[str]] = None) -> str:
         """Generate brief context summary from recent messages"""
-        if not self.conversation_db.exists():
-            return "New conversation, no context yet"
-        
-        conn = sqlite3.connect(self.conversation_db)
-        cursor = conn.cursor()
-        
-        # Get last 5 messages
-        cursor.execute('''
-            SELECT content FROM messages
-            ORDER BY timestamp DESC
-            LIMIT 5
-        ''')
-        
-        messages = [msg[0] for msg in cursor.fetchall()]
-        conn.close()
-        
-        # Extract keywords/topics
-        all_text = " ".join(messages).lower()
-        
-        # Common technical terms
-        topics = []
-        keywords = {
-            'authentication': 'Auth system',
-            'fastapi': 'FastAPI',
-            'jwt': 'JWT tokens',
-            'database': 'Database',
-            'api': 'API development',
-            'memory': 'Memory management',
-            'bridge': 'Memory bridge',
-            'transfer': 'Context transfer',
-            'model': 'Model selection',
-            'session': 'Session handling'
-        }
+        if messages is None:
+            if not self.conversation_db.exists():
+                return "New conversation, no context yet"
+            
+            cursor = self._conv().cursor()
+            
+            # Get last 5 messages
+            cursor.execute(_SQL_SUMMARY)
+            
+            messages = [msg[0] for msg in cursor.fetchall()]
         
-        for keyword, topic in keywords.items():
-            if keyword in all_text:
-                topics.append(topic)
+        # One pass per message finds every keyword; topics keep table order
+        found = set()
+        for content in messages:
+            found.update(match.lower() for match in _KW_PATTERN.findall(content))
+        topics = [topic for keyword, topic in _KW_TO_TOPIC.items() if keyword in found]
         
         if topics:
             return f"Working on: {', '.join(topics[:3])}"
@@ -226,18 +393,11 @@ class ConversationNavigator:
         if not self.conversation_db.exists():
             return []
         
-        conn = sqlite3.connect(self.conversation_db)
-        cursor = conn.cursor()
+        cursor = self._conv().cursor()
         
-        cursor.execute('''
-            SELECT role, content, timestamp
-            FROM messages
-            ORDER BY timestamp DESC
-            LIMIT ?
-        ''', (last_n,))
+        cursor.execute(_SQL_RECAP, (last_n,))
         
         messages = cursor.fetchall()
-        conn.close()
         
         # Reverse to chronological order
         messages = list(reversed(messages))
@@ -253,25 +413,20 @@ class ConversationNavigator:
     
     def format_recap(self, messages: List[Dict]) -> str:
         """Format recap for display"""
-        lines = []
-        lines.append("╔══════════════════════════════════════════════════════════════════════╗")
-        lines.append("║                      CONVERSATION RECAP                              ║")
-        lines.append("╚══════════════════════════════════════════════════════════════════════╝")
-        lines.append("")
+        lines = [_RECAP_HEADER]
         
+        # One pre-joined block per message instead of three appends
+        append = lines.append
         for i, msg in enumerate(messages, 1):
             timestamp = datetime.fromisoformat(msg['timestamp']).strftime('%H:%M:%S')
-            role_icon = "👤" if msg['role'] == 'user' else "🤖"
-            role_label = "YOU" if msg['role'] == 'user' else "AI"
+            role_icon, role_label = _RECAP_ROLES.get(msg['role'], _RECAP_AI)
             
             # Truncate long messages
             content = msg['content']
-            if len(content) > 150:
-                content = content[:150] + "..."
+            if len(content) > RECAP_PREVIEW_CHARS:
+                content = content[:RECAP_PREVIEW_CHARS] + "..."
             
-            lines.append(f"{i}. [{timestamp}] {role_icon} {role_label}:")
-            lines.append(f"   {content}")
-            lines.append("")
+            append(f"{i}. [{timestamp}] {role_icon} {role_label}:\n   {content}\n")
         
         return "\n".join(lines)
     
@@ -282,36 +437,22 @@ class ConversationNavigator:
         
         cutoff = datetime.now() - timedelta(hours=hours)
         
-        conn = sqlite3.connect(self.conversation_db)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT role, content, timestamp
-            FROM messages
-            WHERE timestamp >= ?
-            ORDER BY timestamp ASC
-        ''', (cutoff.isoformat(),))
+        cursor = self._conv().cursor()
+        cutoff = cutoff.isoformat()
         
-        messages = cursor.fetchall()
-        conn.close()
-        
-        # Group into exchanges
-        exchanges = []
-        current_exchange = {'user': None, 'assistant': None, 'time': None}
-        
-        for role, content, timestamp in messages:
-            if role == 'user':
-                if current_exchange['user'] is not None:
-                    # Save previous exchange
-                    exchanges.append(current_exchange.copy())
-                current_exchange = {'user': content[:100], 'assistant': None, 'time': timestamp}
-            elif role == 'assistant':
-                current_exchange['assistant'] = content[:100]
-                exchanges.append(current_exchange.copy())
-                current_exchange = {'user': None, 'assistant': None, 'time': None}
+        # Count and pairs are read from the same snapshot
+        cursor.execute('BEGIN')
+        try:
+            total_messages = cursor.execute(_SQL_TIMELINE_COUNT, (cutoff,)).fetchone()[0]
+            exchanges = [
+                {'user': user, 'assistant': assistant, 'time': timestamp}
+                for user, assistant, timestamp in cursor.execute(_SQL_TIMELINE, (cutoff,))
+            ]
+        finally:
+            cursor.execute('COMMIT')
         
         return {
-            'total_messages': len(messages),
+            'total_messages': total_messages,
             'total_exchanges': len(exchanges),
             'exchanges': exchanges,
             'time_period': f'Last {hours} hours'
@@ -319,48 +460,32 @@ class ConversationNavigator:
     
     def format_timeline(self, timeline: Dict) -> str:
         """Format timeline for display"""
-        lines = []
-        lines.append("╔══════════════════════════════════════════════════════════════════════╗")
-        lines.append("║                      SESSION TIMELINE                                ║")
-        lines.append("╚══════════════════════════════════════════════════════════════════════╝")
-        lines.append("")
-        lines.append(f"📅 Period: {timeline['time_period']}")
-        lines.append(f"💬 Total Messages: {timeline['total_messages']}")
-        lines.append(f"🔄 Total Exchanges: {timeline['total_exchanges']}")
-        lines.append("")
+        lines = [
+            _TIMELINE_HEADER,
+            f"📅 Period: {timeline['time_period']}\n"
+            f"💬 Total Messages: {timeline['total_messages']}\n"
+            f"🔄 Total Exchanges: {timeline['total_exchanges']}\n"
+        ]
         
+        append = lines.append
         for i, exchange in enumerate(timeline['exchanges'], 1):
             time = datetime.fromisoformat(exchange['time']).strftime('%H:%M:%S')
-            lines.append(f"{i}. [{time}]")
-            if exchange['user']:
-                lines.append(f"   👤 {exchange['user']}...")
-            if exchange['assistant']:
-                lines.append(f"   🤖 {exchange['assistant']}...")
-            lines.append("")
+            user = exchange['user']
+            assistant = exchange['assistant']
+            append(
+                f"{i}. [{time}]\n"
+                + (f"   👤 {user}...\n" if user else "")
+                + (f"   🤖 {assistant}...\n" if assistant else "")
+            )
         
         return "\n".join(lines)
     
     def check_bridge_status(self) -> Tuple[bool, Optional[str], Optional[str]]:
         """Check if memory bridge is active"""
-        if not self.bridge_db.exists():
-            return False, None, None
-        
-        conn = sqlite3.connect(self.bridge_db)
-        cursor = conn.cursor()
-        
-        cursor.execute('''
-            SELECT state, user_prompt, expected_recovery_time
-            FROM bridge_activations
-            WHERE successful = 0
-            ORDER BY activation_time DESC
-            LIMIT 1
-        ''')
-        
-        result = cursor.fetchone()
-        conn.close()
+        bridge = self._load_latest_bridge()
         
-        if result and result[0] == 'activated':
-            return True, result[1], f"{result[2]} seconds"
+        if bridge and bridge['state'] == 'activated':
+            return True, bridge['user_prompt'], f"{bridge['expected_recovery_time']} seconds"
         
         return False, None, None
     
@@ -410,8 +535,8 @@ READY TO CONTINUE!
 """.strip()
 
 
-def main():
-    """CLI for conversation navigation"""
+def _parse_args(argv: List[str]):
+    """Full argparse parsing, for options that take values or need help"""
     import argparse
     
     parser = argparse.ArgumentParser(
@@ -420,9 +545,9 @@ def main():
     
     parser.add_argument('--status', action='store_true',
                        help='Show current conversation state')
-    parser.add_argument('--recap', type=int, metavar='N', default=10,
+    parser.add_argument('--recap', type=int, metavar='N', default=DEFAULT_RECAP,
                        help='Show last N exchanges (default: 10)')
-    parser.add_argument('--timeline', type=int, metavar='HOURS', default=24,
+    parser.add_argument('--timeline', type=int, metavar='HOURS', default=DEFAULT_TIMELINE_HOURS,
                        help='Show timeline for last N hours (default: 24)')
     parser.add_argument('--bridge', action='store_true',
                        help='Check bridge status')
@@ -431,7 +556,22 @@ def main():
     parser.add_argument('--where-am-i', action='store_true',
                        help='Complete orientation (status + recap + resume)')
     
-    args = parser.parse_args()
+    return parser.parse_args(argv)
+
+
+def main():
+    """CLI for conversation navigation"""
+    argv = sys.argv[1:]
+    if all(arg in _FLAG_OPTIONS for arg in argv):
+        # Bare flags (the common interactive case) skip importing argparse
+        args = SimpleNamespace(
+            status=False, recap=DEFAULT_RECAP, timeline=DEFAULT_TIMELINE_HOURS,
+            bridge=False, resume=False, where_am_i=False
+        )
+        for arg in argv:
+            setattr(args, _FLAG_OPTIONS[arg], True)
+    else:
+        args = _parse_args(argv)
     
     navigator = ConversationNavigator()
     
@@ -6,16 +6,156 @@ Stores and retrieves conversation history for context and continuity
 
 import sqlite3
 import json
+import sys
+import weakref
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Iterator, Optional, Set, TextIO
+from contextlib import contextmanager
 from dataclasses import dataclass, asdict
+from functools import lru_cache
 
 CONFIG_DIR = Path.home() / ".gh-ai-assistant"
 CONVERSATIONS_DB = CONFIG_DIR / "conversations.db"
 
+# Applied on every connection: WAL lets readers run alongside add_message,
+# NORMAL sync drops the per-commit fsync, and mmap serves reads from the
+# page cache
+CONNECTION_PRAGMAS = '''
+    PRAGMA journal_mode = WAL;
+    PRAGMA synchronous = NORMAL;
+    PRAGMA temp_store = MEMORY;
+    PRAGMA cache_size = -64000;
+    PRAGMA mmap_size = 268435456;
+'''
 
-@dataclass
+
+def _adapt_datetime(value: datetime) -> str:
+    """Store datetimes in the text form the stdlib default adapter used"""
+    return value.isoformat(" ")
+
+
+def _convert_datetime(value: bytes) -> datetime:
+    """Parse DATETIME columns as rows are fetched"""
+    return datetime.fromisoformat(value.decode())
+
+
+sqlite3.register_adapter(datetime, _adapt_datetime)
+sqlite3.register_converter("DATETIME", _convert_datetime)
+
+_SQL_INSERT_SESSION = '''
+    INSERT OR IGNORE INTO conversations (session_id)
+    VALUES (?)
+'''
+
+_SQL_INSERT_MSG = '''
+    INSERT INTO messages
+    (session_id, role, content, timestamp, model_used, tokens_used)
+    VALUES (?, ?, ?, ?, ?, ?)
+'''
+
+# INSERT ... RETURNING needs SQLite 3.35; older builds insert row by row
+# and read each id from lastrowid
+SQLITE_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+# Rows per multi-row INSERT ... RETURNING; 6 parameters each stays under the
+# 32766-variable default limit those builds have
+INSERT_CHUNK_ROWS = 32766 // 6
+
+
+@lru_cache(maxsize=8)
+def _insert_messages_sql(rows: int) -> str:
+    """Multi-row INSERT for rows messages, returning the new ids"""
+    return (
+        'INSERT INTO messages '
+        '(session_id, role, content, timestamp, model_used, tokens_used) VALUES '
+        + ', '.join(['(?, ?, ?, ?, ?, ?)'] * rows)
+        + ' RETURNING id'
+    )
+
+
+_SQL_UPDATE_CONV = '''
+    UPDATE conversations
+    SET last_message_at = ?,
+        message_count = message_count + ?,
+        total_tokens = total_tokens + ?
+    WHERE session_id = ?
+'''
+
+# Newest N messages, returned oldest first
+_SQL_SELECT_LATEST_MESSAGES = '''
+    SELECT role, content, timestamp, model_used, tokens_used
+    FROM (
+        SELECT id, role, content, timestamp, model_used, tokens_used
+        FROM messages
+        WHERE session_id = ?
+        ORDER BY timestamp DESC, id DESC
+        LIMIT ?
+    )
+    ORDER BY timestamp ASC, id ASC
+'''
+
+_SQL_SELECT_MESSAGES = '''
+    SELECT role, content, timestamp, model_used, tokens_used
+    FROM messages
+    WHERE session_id = ?
+    ORDER BY timestamp ASC
+'''
+
+_SQL_SELECT_LATEST_CONTEXT = '''
+    SELECT role, content
+    FROM (
+        SELECT id, role, content, timestamp
+        FROM messages
+        WHERE session_id = ?
+        ORDER BY timestamp DESC, id DESC
+        LIMIT ?
+    )
+    ORDER BY timestamp ASC, id ASC
+'''
+
+_SQL_SELECT_CONTEXT = '''
+    SELECT role, content
+    FROM messages
+    WHERE session_id = ?
+    ORDER BY timestamp ASC
+'''
+
+_SQL_COUNT_MESSAGES = '''
+    SELECT COUNT(*)
+    FROM messages
+    WHERE session_id = ?
+'''
+
+_SQL_SELECT_SESSION = '''
+    SELECT session_id, started_at, last_message_at,
+           message_count, total_tokens, summary
+    FROM conversations
+    WHERE session_id = ?
+'''
+
+_SQL_LIST_SESSIONS = '''
+    SELECT session_id, started_at, last_message_at,
+           message_count, total_tokens, summary
+    FROM conversations
+    ORDER BY last_message_at DESC
+    LIMIT ?
+'''
+
+_SQL_ACTIVE_SESSION = '''
+    SELECT session_id
+    FROM conversations
+    WHERE last_message_at > ?
+    ORDER BY last_message_at DESC
+    LIMIT 1
+'''
+
+
+# dataclass(slots=True) needs Python 3.10; older interpreters keep __dict__
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(**_SLOTS)
 class Message:
     """Individual message in conversation"""
     role: str  # 'user' or 'assistant'
@@ -34,7 +174,7 @@ class Message:
         }
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class Conversation:
     """Complete conversation session"""
     session_id: str
@@ -52,13 +192,34 @@ class ConversationStore:
     
     def __init__(self, db_path: Path = CONVERSATIONS_DB):
         self.db_path = db_path
+        self._conn: Optional[sqlite3.Connection] = None
+        # Sessions known to have a conversations row
+        self._known_sessions: Set[str] = set()
         self._ensure_db()
         
+    def _connect(self) -> sqlite3.Connection:
+        """Return the connection shared by every store operation"""
+        if self._conn is None:
+            self._conn = sqlite3.connect(
+                self.db_path, check_same_thread=False, cached_statements=128,
+                detect_types=sqlite3.PARSE_DECLTYPES
+            )
+            self._conn.executescript(CONNECTION_PRAGMAS)
+            # Closes on interpreter exit or as soon as the store is collected
+            self._finalizer = weakref.finalize(self, self._conn.close)
+        return self._conn
+        
+    def close(self):
+        """Close the shared database connection"""
+        if self._conn is not None:
+            self._finalizer()
+            self._conn = None
+            
     def _ensure_db(self):
         """Initialize conversation database"""
         CONFIG_DIR.mkdir(parents=True, exist_ok=True)
         
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         # Conversations table
@@ -94,103 +255,128 @@ class ConversationStore:
             ON messages(session_id, timestamp)
         ''')
         
+        # Cross-session recap/timeline queries order and range on timestamp
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_messages_ts
+            ON messages(timestamp DESC)
+        ''')
+        
         conn.commit()
-        conn.close()
         
     def create_session(self, session_id: str = None) -> str:
         """Create new conversation session"""
         if not session_id:
             session_id = datetime.now().strftime("%Y%m%d_%H%M%S")
         
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
-        cursor.execute('''
-            INSERT OR IGNORE INTO conversations (session_id)
-            VALUES (?)
-        ''', (session_id,))
+        cursor.execute(_SQL_INSERT_SESSION, (session_id,))
         
         conn.commit()
-        conn.close()
+        self._known_sessions.add(session_id)
         
         return session_id
         
+    def _ensure_session_cached(self, cursor: sqlite3.Cursor, session_id: str):
+        """Create the session row once per store instead of on every message"""
+        if session_id not in self._known_sessions:
+            cursor.execute(_SQL_INSERT_SESSION, (session_id,))
+            self._known_sessions.add(session_id)
+            
     def add_message(self, session_id: str, message: Message):
         """Add message to conversation"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        self.add_messages(session_id, [message])
         
-        # Ensure session exists
-        self.create_session(session_id)
+    @contextmanager
+    def _message_batch(self, session_id: str,
+                       messages: List[Message]) -> Iterator[sqlite3.Cursor]:
+        """
+        Transaction around a batch insert: creates the session first and
+        updates its counters once the caller has inserted the rows
+        """
+        conn = self._connect()
+        try:
+            with conn:
+                cursor = conn.cursor()
+                self._ensure_session_cached(cursor, session_id)
+                
+                yield cursor
+                
+                # Update conversation metadata once for the whole batch
+                cursor.execute(_SQL_UPDATE_CONV, (
+                    messages[-1].timestamp,
+                    len(messages),
+                    sum(msg.tokens_used or 0 for msg in messages),
+                    session_id
+                ))
+        except BaseException:
+            # The session row may have been rolled back with the batch
+            self._known_sessions.discard(session_id)
+            raise
+            
+    def add_messages(self, session_id: str, messages: List[Message]):
+        """Add several messages to a conversation in one transaction"""
+        if not messages:
+            return
+        
+        with self._message_batch(session_id, messages) as cursor:
+            cursor.executemany(_SQL_INSERT_MSG, [
+                (session_id, msg.role, msg.content, msg.timestamp,
+                 msg.model_used, msg.tokens_used)
+                for msg in messages
+            ])
+        
+    def add_messages_returning(self, session_id: str,
+                               messages: List[Message]) -> List[int]:
+        """
+        Add several messages in one transaction and return their row ids
         
-        # Insert message
-        cursor.execute('''
-            INSERT INTO messages 
-            (session_id, role, content, timestamp, model_used, tokens_used)
-            VALUES (?, ?, ?, ?, ?, ?)
-        ''', (
-            session_id,
-            message.role,
-            message.content,
-            message.timestamp,
-            message.model_used,
-            message.tokens_used
-        ))
-        
-        # Update conversation metadata
-        cursor.execute('''
-            UPDATE conversations
-            SET last_message_at = ?,
-                message_count = message_count + 1,
-                total_tokens = total_tokens + ?
-            WHERE session_id = ?
-        ''', (
-            message.timestamp,
-            message.tokens_used or 0,
-            session_id
-        ))
+        Rows go in as multi-row INSERT ... RETURNING statements of up to
+        INSERT_CHUNK_ROWS messages, so ids come back without a SELECT. On
+        SQLite older than 3.35 each row is inserted on its own instead.
         
-        conn.commit()
-        conn.close()
+        Returns:
+            Message ids, in the order of messages
+        """
+        if not messages:
+            return []
+        
+        ids: List[int] = []
+        with self._message_batch(session_id, messages) as cursor:
+            if not SQLITE_HAS_RETURNING:
+                for msg in messages:
+                    cursor.execute(_SQL_INSERT_MSG, (
+                        session_id, msg.role, msg.content, msg.timestamp,
+                        msg.model_used, msg.tokens_used
+                    ))
+                    ids.append(cursor.lastrowid)
+                return ids
+                
+            for start in range(0, len(messages), INSERT_CHUNK_ROWS):
+                chunk = messages[start:start + INSERT_CHUNK_ROWS]
+                cursor.execute(_insert_messages_sql(len(chunk)), [
+                    value
+                    for msg in chunk
+                    for value in (session_id, msg.role, msg.content, msg.timestamp,
+                                  msg.model_used, msg.tokens_used)
+                ])
+                # RETURNING order is unspecified; ids ascend with insert order
+                ids.extend(sorted(row[0] for row in cursor))
+        return ids
         
     def get_messages(self, session_id: str, limit: int = None) -> List[Message]:
         """Get messages from conversation"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         if limit:
-            cursor.execute('''
-                SELECT role, content, timestamp, model_used, tokens_used
-                FROM messages
-                WHERE session_id = ?
-                ORDER BY timestamp DESC
-                LIMIT ?
-            ''', (session_id, limit))
+            cursor.execute(_SQL_SELECT_LATEST_MESSAGES, (session_id, limit))
         else:
-            cursor.execute('''
-                SELECT role, content, timestamp, model_used, tokens_used
-                FROM messages
-                WHERE session_id = ?
-                ORDER BY timestamp ASC
-            ''', (session_id,))
-        
-        messages = []
-        for row in cursor.fetchall():
-            messages.append(Message(
-                role=row[0],
-                content=row[1],
-                timestamp=datetime.fromisoformat(row[2]) if isinstance(row[2], str) else row[2],
-                model_used=row[3],
-                tokens_used=row[4]
-            ))
-        
-        conn.close()
-        
-        # If limit was specified, reverse to get chronological order
-        if limit:
-            messages.reverse()
+            cursor.execute(_SQL_SELECT_MESSAGES, (session_id,))
         
-        return messages
+        # Columns are selected in Message field order
+        return [Message(*row) for row in cursor]
         
     def get_recent_context(self, session_id: str, 
                           message_count: int = 10) -> List[Dict]:
@@ -198,128 +384,123 @@ class ConversationStore:
         Get recent messages formatted for AI context
         Returns messages in format suitable for OpenRouter/OpenAI API
         """
-        messages = self.get_messages(session_id, limit=message_count)
+        return self.get_recent_context_fast(session_id, message_count)
+        
+    def get_recent_context_fast(self, session_id: str,
+                                message_count: int = 10) -> List[Dict]:
+        """Select only role/content, skipping Message construction"""
+        cursor = self._connect().cursor()
         
-        return [
-            {
-                'role': msg.role,
-                'content': msg.content
-            }
-            for msg in messages
-        ]
+        if message_count:
+            cursor.execute(_SQL_SELECT_LATEST_CONTEXT, (session_id, message_count))
+        else:
+            cursor.execute(_SQL_SELECT_CONTEXT, (session_id,))
+        
+        return [{'role': role, 'content': content} for role, content in cursor]
         
     def get_session_info(self, session_id: str) -> Optional[Conversation]:
         """Get conversation session information"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
-        cursor.execute('''
-            SELECT session_id, started_at, last_message_at, 
-                   message_count, total_tokens, summary
-            FROM conversations
-            WHERE session_id = ?
-        ''', (session_id,))
+        cursor.execute(_SQL_SELECT_SESSION, (session_id,))
         
         row = cursor.fetchone()
-        conn.close()
         
         if row:
-            return Conversation(
-                session_id=row[0],
-                started_at=datetime.fromisoformat(row[1]) if isinstance(row[1], str) else row[1],
-                last_message_at=datetime.fromisoformat(row[2]) if isinstance(row[2], str) else row[2],
-                message_count=row[3],
-                total_tokens=row[4],
-                summary=row[5]
-            )
+            return Conversation(*row)
         
         return None
         
     def list_sessions(self, limit: int = 10) -> List[Conversation]:
         """List recent conversation sessions"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
-        cursor.execute('''
-            SELECT session_id, started_at, last_message_at,
-                   message_count, total_tokens, summary
-            FROM conversations
-            ORDER BY last_message_at DESC
-            LIMIT ?
-        ''', (limit,))
-        
-        sessions = []
-        for row in cursor.fetchall():
-            sessions.append(Conversation(
-                session_id=row[0],
-                started_at=datetime.fromisoformat(row[1]) if isinstance(row[1], str) else row[1],
-                last_message_at=datetime.fromisoformat(row[2]) if isinstance(row[2], str) else row[2],
-                message_count=row[3],
-                total_tokens=row[4],
-                summary=row[5]
-            ))
-        
-        conn.close()
-        return sessions
+        cursor.execute(_SQL_LIST_SESSIONS, (limit,))
+        
+        # Columns are selected in Conversation field order
+        return [Conversation(*row) for row in cursor]
         
     def get_active_session(self) -> Optional[str]:
         """Get most recent active session (within last hour)"""
-        conn = sqlite3.connect(self.db_path)
+        conn = self._connect()
         cursor = conn.cursor()
         
         one_hour_ago = datetime.now() - timedelta(hours=1)
         
-        cursor.execute('''
-            SELECT session_id
-            FROM conversations
-            WHERE last_message_at > ?
-            ORDER BY last_message_at DESC
-            LIMIT 1
-        ''', (one_hour_ago,))
+        cursor.execute(_SQL_ACTIVE_SESSION, (one_hour_ago,))
         
         row = cursor.fetchone()
-        conn.close()
         
         return row[0] if row else None
         
-    def export_conversation(self, session_id: str, 
-                           format: str = 'json') -> str:
-        """Export conversation to file"""
-        messages = self.get_messages(session_id)
+    def _iter_messages(self, session_id: str) -> Iterator[Message]:
+        """Yield a conversation's messages as SQLite steps through them"""
+        cursor = self._connect().cursor()
+        cursor.execute(_SQL_SELECT_MESSAGES, (session_id,))
+        for row in cursor:
+            yield Message(*row)
+            
+    def _export_chunks(self, session_id: str, format: str) -> Iterator[str]:
+        """Yield the export text piece by piece, one message at a time"""
         session = self.get_session_info(session_id)
+        cursor = self._connect().cursor()
+        cursor.execute(_SQL_COUNT_MESSAGES, (session_id,))
+        message_count = cursor.fetchone()[0]
         
         if format == 'json':
-            export_data = {
-                'session_id': session_id,
-                'started_at': session.started_at.isoformat() if session else None,
-                'message_count': len(messages),
-                'messages': [msg.to_dict() for msg in messages]
-            }
-            return json.dumps(export_data, indent=2)
+            # Same text as json.dumps(export_data, indent=2), written per message
+            started_at = session.started_at.isoformat() if session else None
+            yield (
+                '{\n'
+                f'  "session_id": {json.dumps(session_id)},\n'
+                f'  "started_at": {json.dumps(started_at)},\n'
+                f'  "message_count": {message_count},\n'
+                '  "messages": ['
+            )
+            separator = '\n    '
+            for msg in self._iter_messages(session_id):
+                yield separator + json.dumps(msg.to_dict(), indent=2).replace('\n', '\n    ')
+                separator = ',\n    '
+            yield ']\n}' if separator == '\n    ' else '\n  ]\n}'
         
         elif format == 'markdown':
-            lines = [
+            yield "\n".join([
                 f"# Conversation: {session_id}",
                 f"Started: {session.started_at if session else 'Unknown'}",
-                f"Messages: {len(messages)}",
+                f"Messages: {message_count}",
                 "",
                 "---",
                 ""
-            ]
+            ])
             
-            for msg in messages:
+            for msg in self._iter_messages(session_id):
                 role_emoji = "👤" if msg.role == "user" else "🤖"
-                lines.append(f"## {role_emoji} {msg.role.title()}")
-                if msg.model_used:
-                    lines.append(f"*Model: {msg.model_used}*")
-                lines.append("")
-                lines.append(msg.content)
-                lines.append("")
-                lines.append("---")
-                lines.append("")
+                model_line = f"\n*Model: {msg.model_used}*" if msg.model_used else ""
+                yield f"\n## {role_emoji} {msg.role.title()}{model_line}\n\n{msg.content}\n\n---\n"
+        
+    def export_conversation(self, session_id: str, 
+                           format: str = 'json',
+                           out: Optional[TextIO] = None) -> str:
+        """
+        Export conversation as JSON or markdown
+        
+        Args:
+            session_id: Conversation to export
+            format: 'json' or 'markdown'
+            out: Writable text stream; when given, the export is streamed
+                into it message by message instead of built in memory
             
-            return "\n".join(lines)
+        Returns:
+            The export text, or an empty string when written to out
+        """
+        chunks = self._export_chunks(session_id, format)
+        if out is None:
+            return "".join(chunks)
         
+        for chunk in chunks:
+            out.write(chunk)
         return ""
 
 
@@ -362,8 +543,9 @@ def main():
         )
     ]
     
+    # One transaction for the whole batch
+    store.add_messages(session_id, messages)
     for msg in messages:
-        store.add_message(session_id, msg)
         print(f"Added: {msg.role} - {msg.content[:50]}...")
     
     print()
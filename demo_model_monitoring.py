@@ -6,7 +6,7 @@ Demonstrates the intelligent model selection system
 
 import time
 from model_monitor import ModelMonitor, SmartModelSelector
-from gh_ai_core import TokenManager, FREE_MODELS
+from gh_ai_core import TokenManager, FREE_MODELS, FREE_MODELS_BY_ID
 
 def demo_monitoring():
     """Demonstrate the model monitoring system"""
@@ -62,11 +62,7 @@ def demo_monitoring():
     print("📊 Step 2: Current Model Rankings")
     print("="*80)
     
-    today_usage = {}
-    for model in FREE_MODELS:
-        model_id = model['id']
-        requests, tokens = token_manager.get_today_usage(model_id)
-        today_usage[model_id] = (requests, tokens)
+    today_usage = token_manager.get_today_usage_all()
     
     monitor.print_model_rankings(FREE_MODELS, today_usage)
     
@@ -91,7 +87,7 @@ def demo_monitoring():
     print("If the primary model fails, the system will try these models in order:")
     print()
     for i, model_id in enumerate(fallback_sequence, 1):
-        model_info = next((m for m in FREE_MODELS if m['id'] == model_id), None)
+        model_info = FREE_MODELS_BY_ID.get(model_id)
         if model_info:
             print(f"  {i}. {model_info['name']}")
             print(f"     ID: {model_id}")
@@ -9,24 +9,23 @@ import os
 import sys
 import json
 import sqlite3
-import asyncio
-import argparse
+import random
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
 from dataclasses import dataclass, asdict
+from contextlib import contextmanager
 import subprocess
-
-try:
-    import keyring
-except ImportError:  # pragma: no cover - optional dependency
-    keyring = None
+import weakref
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from pathlib import Path
 import time
 
 from token_recycler.config import CONFIG_DIR, USAGE_DB, ensure_config_dir
-from token_recycler.service import TokenRecyclerService
 from providers import (
     ClaudeCLIClient,
     ClaudeCLIError,
@@ -80,6 +79,72 @@ CONFIG_FILE = CONFIG_DIR / "config.json"
 KEYRING_SERVICE = "gh-ai-assistant"
 ENV_FILE = Path(os.getenv("GH_AI_ENV_FILE", ".env"))
 
+# Applied once to the TokenManager connection; WAL keeps usage writes cheap
+USAGE_DB_PRAGMAS = '''
+    PRAGMA journal_mode = WAL;
+    PRAGMA synchronous = NORMAL;
+    PRAGMA temp_store = MEMORY;
+    PRAGMA cache_size = -20000;
+'''
+
+# OpenRouter allows about 20 requests/minute on free models; pace each model below that
+FREE_MODEL_RPM = 20
+# 429 retries per request, with jittered exponential backoff capped at BACKOFF_CAP seconds
+RATE_LIMIT_RETRIES = 2
+BACKOFF_BASE = 1.0
+BACKOFF_CAP = 8.0
+
+_SQL_INSERT_USAGE = '''
+    INSERT INTO usage (model, tokens_used, cost)
+    VALUES (?, ?, ?)
+'''
+
+# DATE('now') matches DATE(CURRENT_TIMESTAMP) on the row written alongside it
+_SQL_UPSERT_USAGE_DAILY = '''
+    INSERT INTO usage_daily (model, day, requests, tokens, cost)
+    VALUES (?, DATE('now'), 1, ?, ?)
+    ON CONFLICT(model, day) DO UPDATE SET
+        requests = requests + 1,
+        tokens = tokens + excluded.tokens,
+        cost = cost + excluded.cost
+'''
+
+_SQL_BACKFILL_USAGE_DAILY = '''
+    INSERT INTO usage_daily (model, day, requests, tokens, cost)
+    SELECT model, DATE(timestamp), COUNT(*),
+           COALESCE(SUM(tokens_used), 0), COALESCE(SUM(cost), 0.0)
+    FROM usage
+    GROUP BY model, DATE(timestamp)
+'''
+
+
+def _should_fail_over(error: Dict) -> bool:
+    """
+    Whether an error response may go away on a different model
+    Server errors, unknown or unavailable models (404) and network failures
+    (no status code) are worth another model; any other 4xx (bad request,
+    invalid or exhausted key) would fail the same way on every model
+    """
+    status_code = error.get("status_code")
+    return status_code is None or status_code == 404 or status_code >= 500
+
+
+def _import_keyring():
+    """Import keyring on first use; its platform backends are slow to load."""
+    try:
+        import keyring
+    except ImportError:  # pragma: no cover - optional dependency
+        return None
+    return keyring
+
+
+def __getattr__(name):
+    # Keeps ``gh_ai_core.keyring`` importable/patchable without loading it eagerly
+    if name == "keyring":
+        return _import_keyring()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 def load_env_file(path: Path = ENV_FILE) -> None:
     """Load environment variables from a local .env file if present."""
 
@@ -103,6 +168,10 @@ load_env_file()
 
 PROVIDER_CHOICES = ["openrouter", "claude-cli", "zai-glm"]
 
+# CLI subcommands that take no options; main() dispatches them without argparse
+_BARE_COMMANDS = frozenset({"setup", "models", "rankings", "recommend", "memory", "bridge"})
+DEFAULT_STATS_DAYS = 7
+
 # Free model prioritization based on OpenRouter
 # Note: Free models have daily limits. Check https://openrouter.ai/models for current availability
 FREE_MODELS = [
@@ -140,6 +209,8 @@ FREE_MODELS = [
     }
 ]
 
+FREE_MODELS_BY_ID = {model["id"]: model for model in FREE_MODELS}
+
 # Local Ollama models (unlimited usage!)
 OLLAMA_MODELS = [
     {
@@ -222,7 +293,11 @@ class OllamaClient:
             return {"error": str(e)}
 
 
-@dataclass
+# Slotted records on 3.10+, where dataclass() accepts slots=True
+_SLOTS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+
+@dataclass(frozen=True, **_SLOTS)
 class UsageRecord:
     """Track API usage for a specific model"""
     model: str
@@ -237,6 +312,10 @@ class TokenManager:
     
     def __init__(self):
         self.db_path = USAGE_DB
+        self._conn: Optional[sqlite3.Connection] = None
+        self._conn_path: Optional[Path] = None
+        # (date, usage) from the last get_today_usage_all; cleared on every write
+        self._today_cache: Optional[Tuple[str, Dict[str, Tuple[int, int]]]] = None
         self._ensure_config_dir()
         self._init_database()
         
@@ -244,80 +323,128 @@ class TokenManager:
         """Create configuration directory if it doesn't exist"""
         ensure_config_dir()
         
+    def _connect(self) -> sqlite3.Connection:
+        """Return the shared usage connection, reopening it if db_path moved"""
+        if self._conn is None or self._conn_path != self.db_path:
+            self.close()
+            self._conn = sqlite3.connect(
+                self.db_path, isolation_level=None, check_same_thread=False
+            )
+            self._conn.executescript(USAGE_DB_PRAGMAS)
+            self._conn_path = self.db_path
+            # Closes on interpreter exit or as soon as the manager is collected
+            self._finalizer = weakref.finalize(self, self._conn.close)
+        return self._conn
+        
+    def close(self):
+        """Close the shared usage connection"""
+        if self._conn is not None:
+            self._finalizer()
+            self._conn = None
+            self._conn_path = None
+            self._today_cache = None
+        
+    @contextmanager
+    def _transaction(self):
+        """Run the enclosed statements in one explicit transaction"""
+        conn = self._connect()
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+        
     def _init_database(self):
         """Initialize SQLite database for usage tracking"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('''
-            CREATE TABLE IF NOT EXISTS usage (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                model TEXT NOT NULL,
-                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
-                tokens_used INTEGER NOT NULL,
-                request_count INTEGER DEFAULT 1,
-                cost REAL DEFAULT 0.0
-            )
-        ''')
-        conn.commit()
-        conn.close()
+        with self._transaction() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS usage (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    model TEXT NOT NULL,
+                    timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                    tokens_used INTEGER NOT NULL,
+                    request_count INTEGER DEFAULT 1,
+                    cost REAL DEFAULT 0.0
+                )
+            ''')
+            # Per-model daily totals kept in step with the usage log by record_usage
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS usage_daily (
+                    model TEXT NOT NULL,
+                    day DATE NOT NULL,
+                    requests INTEGER NOT NULL DEFAULT 0,
+                    tokens INTEGER NOT NULL DEFAULT 0,
+                    cost REAL NOT NULL DEFAULT 0.0,
+                    PRIMARY KEY (model, day)
+                )
+            ''')
+            if conn.execute("SELECT 1 FROM usage_daily LIMIT 1").fetchone() is None:
+                conn.execute(_SQL_BACKFILL_USAGE_DAILY)
         
     def record_usage(self, model: str, tokens_used: int, cost: float = 0.0):
         """Record API usage in database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cursor.execute('''
-            INSERT INTO usage (model, tokens_used, cost)
-            VALUES (?, ?, ?)
-        ''', (model, tokens_used, cost))
-        conn.commit()
-        conn.close()
+        self.record_usage_many([(model, tokens_used, cost)])
+        
+    def record_usage_many(self, rows: Iterable[Tuple[str, int, float]]):
+        """Record several (model, tokens_used, cost) usages in one transaction"""
+        rows = list(rows)
+        if not rows:
+            return
+        with self._transaction() as conn:
+            conn.executemany(_SQL_INSERT_USAGE, rows)
+            conn.executemany(_SQL_UPSERT_USAGE_DAILY, rows)
+        self._today_cache = None
+        
+    def get_today_usage_all(self) -> Dict[str, Tuple[int, int]]:
+        """Get today's usage for every model used today (requests, tokens)"""
+        today = datetime.now().date().isoformat()
+        conn = self._connect()  # drops the cache if db_path was reassigned
+        if self._today_cache is None or self._today_cache[0] != today:
+            cursor = conn.execute('''
+                SELECT model, requests, tokens
+                FROM usage_daily
+                WHERE day = ?
+            ''', (today,))
+            usage = {model: (requests, tokens) for model, requests, tokens in cursor}
+            self._today_cache = (today, usage)
+        return dict(self._today_cache[1])
         
     def get_today_usage(self, model: str) -> Tuple[int, int]:
         """Get today's usage for a specific model (requests, tokens)"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        today = datetime.now().date().isoformat()
-        cursor.execute('''
-            SELECT COUNT(*), COALESCE(SUM(tokens_used), 0)
-            FROM usage
-            WHERE model = ? AND DATE(timestamp) = ?
-        ''', (model, today))
-        result = cursor.fetchone()
-        conn.close()
-        return (result[0] or 0, result[1] or 0)
+        return self.get_today_usage_all().get(model, (0, 0))
         
     def get_usage_stats(self, days: int = 7) -> Dict[str, Dict]:
         """Get usage statistics for the last N days"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        cutoff_date = datetime.now() - timedelta(days=days)
+        cutoff_day = (datetime.now() - timedelta(days=days)).date().isoformat()
         
-        cursor.execute('''
+        cursor = self._connect().execute('''
             SELECT model, 
-                   COUNT(*) as request_count,
-                   SUM(tokens_used) as total_tokens,
+                   SUM(requests) as request_count,
+                   SUM(tokens) as total_tokens,
                    SUM(cost) as total_cost
-            FROM usage
-            WHERE timestamp >= ?
+            FROM usage_daily
+            WHERE day >= ?
             GROUP BY model
-        ''', (cutoff_date,))
+        ''', (cutoff_day,))
         
         stats = {}
-        for row in cursor.fetchall():
+        for row in cursor:
             stats[row[0]] = {
                 'requests': row[1],
                 'tokens': row[2],
                 'cost': row[3]
             }
         
-        conn.close()
         return stats
         
     def get_optimal_model(self, task_type: str = "general") -> str:
         """Select optimal free model based on current usage"""
+        today_usage = self.get_today_usage_all()
         for model in FREE_MODELS:
             model_id = model['id']
-            requests, tokens = self.get_today_usage(model_id)
+            requests, tokens = today_usage.get(model_id, (0, 0))
             
             # Check if we're under 90% of daily limit
             if requests < (model['daily_limit'] * 0.9):
@@ -327,6 +454,30 @@ class TokenManager:
         return FREE_MODELS[0]['id']
 
 
+class TokenBucket:
+    """Token bucket that paces requests to a single model"""
+    
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        
+    def acquire(self) -> float:
+        """Take one token, sleeping until it is available. Returns seconds waited"""
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        wait = (1 - self.tokens) / self.rate
+        time.sleep(wait)
+        self.tokens = 0.0
+        self.updated = now + wait
+        return wait
+
+
 class OpenRouterClient:
     """OpenRouter API client with free model support"""
     
@@ -339,10 +490,79 @@ class OpenRouterClient:
             "X-Title": "GitHub CLI AI Assistant",
             "Content-Type": "application/json"
         }
+        # Keep-alive session so repeated asks reuse one TLS connection
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+        self.session.mount("https://", HTTPAdapter(
+            pool_connections=4, pool_maxsize=8, max_retries=Retry(total=0)
+        ))
+        self._buckets: Dict[str, TokenBucket] = {}
+        
+    def _bucket(self, model: str) -> TokenBucket:
+        """Return the request pacer for a model"""
+        bucket = self._buckets.get(model)
+        if bucket is None:
+            bucket = TokenBucket(rate=FREE_MODEL_RPM / 60.0, capacity=FREE_MODEL_RPM)
+            self._buckets[model] = bucket
+        return bucket
+        
+    @staticmethod
+    def _retry_delay(response: requests.Response, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying a 429, or None if not worth waiting"""
+        retry_after = response.headers.get("Retry-After")
+        if retry_after:
+            try:
+                delay = float(retry_after)
+            except ValueError:
+                return None
+        else:
+            delay = BACKOFF_BASE * (2 ** attempt) * random.uniform(0.5, 1.5)
+        # A long Retry-After usually means the quota is gone; fail over instead
+        return delay if delay <= BACKOFF_CAP else None
+        
+    @staticmethod
+    def _read_stream(response: requests.Response,
+                     on_delta: Optional[Callable[[str], None]]) -> Dict:
+        """Assemble a server-sent-events completion, forwarding each content delta"""
+        parts = []
+        usage = {}
+        with response:
+            for raw in response.iter_lines():
+                line = raw.decode("utf-8") if isinstance(raw, bytes) else raw
+                # Skip keep-alive blanks and ": OPENROUTER PROCESSING" comments
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    break
+                try:
+                    event = json.loads(data)
+                except ValueError:
+                    continue
+                if "error" in event:
+                    error = event["error"]
+                    message = error.get("message", str(error)) if isinstance(error, dict) else str(error)
+                    return {"error": message}
+                usage = event.get("usage") or usage
+                for choice in event.get("choices") or []:
+                    delta = (choice.get("delta") or {}).get("content")
+                    if delta:
+                        parts.append(delta)
+                        if on_delta:
+                            on_delta(delta)
+        return {
+            "choices": [{"message": {"role": "assistant", "content": "".join(parts)}}],
+            "usage": usage,
+        }
         
     def chat_completion(self, model: str, messages: List[Dict], 
-                       max_tokens: int = 2048) -> Dict:
-        """Send chat completion request to OpenRouter"""
+                       max_tokens: int = 2048, stream: bool = False,
+                       on_delta: Optional[Callable[[str], None]] = None) -> Dict:
+        """Send chat completion request to OpenRouter
+        
+        With stream=True the reply is read as it is generated and every content
+        delta is passed to on_delta; the returned dict has the usual shape.
+        """
         url = f"{self.base_url}/chat/completions"
         
         payload = {
@@ -350,67 +570,103 @@ class OpenRouterClient:
             "messages": messages,
             "max_tokens": max_tokens
         }
+        if stream:
+            payload["stream"] = True
+            payload["stream_options"] = {"include_usage": True}
         
-        try:
-            response = requests.post(url, headers=self.headers, json=payload, timeout=60)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.HTTPError as e:
-            if response.status_code == 429:
-                # Rate limit exceeded
-                error_detail = ""
-                try:
-                    error_data = response.json()
-                    error_detail = error_data.get('error', {}).get('message', '')
-                except:
-                    pass
-                return {
-                    "error": "rate_limit",
-                    "status_code": 429,
-                    "message": "Rate limit exceeded for this model",
-                    "detail": error_detail,
-                    "model": model
-                }
-            return {"error": str(e), "status_code": response.status_code}
-        except requests.exceptions.RequestException as e:
-            return {"error": str(e)}
+        for attempt in range(RATE_LIMIT_RETRIES + 1):
+            self._bucket(model).acquire()
+            try:
+                response = self.session.post(url, json=payload, timeout=60, stream=stream)
+                response.raise_for_status()
+                if stream:
+                    return self._read_stream(response, on_delta)
+                return response.json()
+            except requests.exceptions.HTTPError as e:
+                if response.status_code == 429:
+                    delay = self._retry_delay(response, attempt)
+                    if delay is not None and attempt < RATE_LIMIT_RETRIES:
+                        # Hand a streamed connection back to the pool before waiting
+                        response.close()
+                        time.sleep(delay)
+                        continue
+                    # Rate limit exceeded
+                    error_detail = ""
+                    try:
+                        error_data = response.json()
+                        error_detail = error_data.get('error', {}).get('message', '')
+                    except:
+                        pass
+                    return {
+                        "error": "rate_limit",
+                        "status_code": 429,
+                        "message": "Rate limit exceeded for this model",
+                        "detail": error_detail,
+                        "model": model
+                    }
+                return {"error": str(e), "status_code": response.status_code}
+            except requests.exceptions.RequestException as e:
+                return {"error": str(e)}
+
+
+# git queries behind GitHubContextExtractor.get_repo_info, keyed by result field
+_GIT_INFO_COMMANDS = {
+    "repo_url": ["git", "config", "--get", "remote.origin.url"],
+    "branch": ["git", "branch", "--show-current"],
+    "recent_commits": ["git", "log", "-5", "--oneline"],
+}
+# Files under .git whose mtimes move on checkout, commit, reset or remote changes
+_GIT_STATE_FILES = ("HEAD", "logs/HEAD", "config")
+# Last repo info, keyed by cwd plus the mtimes above
+_REPO_INFO_CACHE: Dict[Tuple, Dict] = {}
 
 
 class GitHubContextExtractor:
     """Extract context from GitHub repository and current state"""
     
+    @staticmethod
+    def _repo_state_key() -> Optional[Tuple]:
+        """Key that changes whenever get_repo_info's answers can change"""
+        cwd = Path.cwd()
+        for directory in (cwd, *cwd.parents):
+            git_dir = directory / ".git"
+            if git_dir.is_dir():
+                stamps = []
+                for name in _GIT_STATE_FILES:
+                    try:
+                        stamps.append((git_dir / name).stat().st_mtime_ns)
+                    except OSError:
+                        stamps.append(None)
+                return (str(cwd), *stamps)
+            if git_dir.exists():
+                return None  # worktree or submodule pointer file; don't cache
+        return None
+        
     @staticmethod
     def get_repo_info() -> Dict:
         """Get current repository information"""
+        key = GitHubContextExtractor._repo_state_key()
+        if key is not None and key in _REPO_INFO_CACHE:
+            return dict(_REPO_INFO_CACHE[key])
+        
         try:
-            # Get repo name
-            result = subprocess.run(
-                ["git", "config", "--get", "remote.origin.url"],
-                capture_output=True, text=True, check=True
-            )
-            repo_url = result.stdout.strip()
-            
-            # Get current branch
-            result = subprocess.run(
-                ["git", "branch", "--show-current"],
-                capture_output=True, text=True, check=True
-            )
-            branch = result.stdout.strip()
-            
-            # Get recent commits
-            result = subprocess.run(
-                ["git", "log", "-5", "--oneline"],
-                capture_output=True, text=True, check=True
-            )
-            recent_commits = result.stdout.strip()
-            
-            return {
-                "repo_url": repo_url,
-                "branch": branch,
-                "recent_commits": recent_commits
-            }
+            # Remote URL, branch and recent commits are independent; fetch them concurrently
+            with ThreadPoolExecutor(max_workers=len(_GIT_INFO_COMMANDS)) as executor:
+                futures = {
+                    field: executor.submit(
+                        subprocess.run, command,
+                        capture_output=True, text=True, check=True
+                    )
+                    for field, command in _GIT_INFO_COMMANDS.items()
+                }
+                info = {field: future.result().stdout.strip() for field, future in futures.items()}
         except subprocess.CalledProcessError:
             return {}
+        
+        if key is not None:
+            _REPO_INFO_CACHE.clear()
+            _REPO_INFO_CACHE[key] = info
+        return dict(info)
             
     @staticmethod
     def get_current_changes() -> str:
@@ -445,9 +701,9 @@ class AIAssistant:
             self.provider_mode = "openrouter"
             self.client = OpenRouterClient(self.api_key) if self.api_key else None
 
+        # Built on first cloud request by _ensure_token_recycler; importing it
+        # pulls in aiohttp and tiktoken, which commands like `models` never need
         self.token_recycler = None
-        if self.provider_mode == "openrouter":
-            self._init_token_recycler()
 
         self.ollama_client = OllamaClient()
         self.github_context = GitHubContextExtractor()
@@ -490,23 +746,32 @@ class AIAssistant:
         self.current_model = None
         self.current_token_count = 0
         self.exhausted_models = []  # Track which models hit limits
+        self.last_response_streamed = False
+        self._streamed_parts: List[str] = []
         
     def _load_api_key(self) -> Optional[str]:
         """Load API key from system keyring"""
+        keyring = _import_keyring()
         if keyring is None:
             return None
         return keyring.get_password(KEYRING_SERVICE, "openrouter_api_key")
         
     def _save_api_key(self, api_key: str):
         """Save API key to system keyring"""
+        keyring = _import_keyring()
         if keyring is None:
             print("⚠️  Keyring module not available. Skipping secure storage.")
             return
         keyring.set_password(KEYRING_SERVICE, "openrouter_api_key", api_key)
+        from api_keys import invalidate_configured_manifest
+        
+        invalidate_configured_manifest()
 
     def _init_token_recycler(self) -> None:
         """Ensure the token recycler service mirrors the current API client."""
         if self.client:
+            from token_recycler.service import TokenRecyclerService
+
             self.token_recycler = TokenRecyclerService(
                 api_call=self.client.chat_completion,
                 token_manager=self.token_manager,
@@ -589,9 +854,38 @@ class AIAssistant:
         messages.append({"role": "user", "content": user_prompt})
         return messages
         
-    def ask(self, prompt: str, use_context: bool = True, provider: Optional[str] = None) -> str:
-        """Ask the AI assistant a question with cloud and local fallback"""
-
+    def _print_delta(self, delta: str) -> None:
+        """Echo a streamed completion chunk as soon as it arrives"""
+        self._streamed_parts.append(delta)
+        print(delta, end="", flush=True)
+        
+    def _discard_partial_stream(self) -> None:
+        """End the line left by a stream that failed partway and forget its text"""
+        if self._streamed_parts:
+            print()
+            self._streamed_parts = []
+        
+    def ask(self, prompt: str, use_context: bool = True, provider: Optional[str] = None,
+            stream: bool = False) -> str:
+        """Ask the AI assistant a question with cloud and local fallback
+        
+        With stream=True, cloud replies are printed while they arrive and
+        last_response_streamed tells the caller not to print them again.
+        """
+        self._streamed_parts = []
+        stream_kwargs = {"stream": True, "on_delta": self._print_delta} if stream else None
+        response = self._ask(prompt, use_context, provider, stream_kwargs)
+        
+        # Only the attempt whose text is being returned counts as already shown
+        streamed = "".join(self._streamed_parts)
+        self.last_response_streamed = bool(streamed) and response == streamed
+        if not self.last_response_streamed:
+            self._discard_partial_stream()
+        return response
+        
+    def _ask(self, prompt: str, use_context: bool, provider: Optional[str],
+             stream_kwargs: Optional[Dict]) -> str:
+        """Route one question through the configured provider and fallbacks"""
         active_provider = (provider or self.provider_mode or "openrouter").lower()
         if active_provider not in {"openrouter", "claude-cli", "zai-glm"}:
             active_provider = "openrouter"
@@ -673,10 +967,11 @@ class AIAssistant:
                 # Use default order if monitoring not available
                 models_to_try = [model['id'] for model in FREE_MODELS]
             
+            today_usage = self.token_manager.get_today_usage_all()
             for attempt, model in enumerate(models_to_try):
                 # Check if this model is already at limit
-                requests, tokens = self.token_manager.get_today_usage(model)
-                model_info = next((m for m in FREE_MODELS if m['id'] == model), None)
+                requests, tokens = today_usage.get(model, (0, 0))
+                model_info = FREE_MODELS_BY_ID.get(model)
                 
                 if model_info and requests >= model_info['daily_limit']:
                     if attempt == 0:
@@ -701,17 +996,19 @@ class AIAssistant:
                         model=model,
                         messages=messages,
                         use_cache=True,
+                        api_kwargs=stream_kwargs,
                     )
                     latency_ms = result.latency_ms
                 else:
                     start_time = time.time()
-                    response = self.client.chat_completion(model, messages)
+                    response = self.client.chat_completion(model, messages, **(stream_kwargs or {}))
                     latency_ms = (time.time() - start_time) * 1000
 
                 self.current_model = model
 
                 if result:
                     if result.is_error():
+                        self._discard_partial_stream()
                         error_payload = result.error or {}
                         error_type = error_payload.get("error") or error_payload.get("type")
 
@@ -783,7 +1080,16 @@ class AIAssistant:
                             else:
                                 return f"❌ Failed to get valid response from any model. Last error: {detail}"
                         else:
-                            return f"❌ Error: {error_payload.get('error', error_payload.get('detail', 'Unknown error'))}"
+                            error_text = error_payload.get('error', error_payload.get('detail', 'Unknown error'))
+                            if not _should_fail_over(error_payload):
+                                return f"❌ Error: {error_text}"
+                            if self.model_selector:
+                                self.model_selector.mark_failure(model, error_type or "error")
+                            if attempt < len(models_to_try) - 1:
+                                print(f"⚠️  {model} failed: {error_text}")
+                                print(f"🔄 Trying next cloud model...")
+                                continue
+                            return f"❌ Error: {error_text}"
 
                     content = result.content or ""
                     tokens_used = result.tokens_used()
@@ -847,6 +1153,7 @@ class AIAssistant:
                     return content
                 else:
                     if "error" in response:
+                        self._discard_partial_stream()
                         error_type = response.get("error")
 
                         if self.monitor:
@@ -907,7 +1214,16 @@ class AIAssistant:
                                 else:
                                     return self._rate_limit_error_message()
                         else:
-                            return f"❌ Error: {response.get('error', 'Unknown error')}"
+                            error_text = response.get('error', 'Unknown error')
+                            if not _should_fail_over(response):
+                                return f"❌ Error: {error_text}"
+                            if self.model_selector:
+                                self.model_selector.mark_failure(model, error_type or "error")
+                            if attempt < len(models_to_try) - 1:
+                                print(f"⚠️  {model} failed: {error_text}")
+                                print(f"🔄 Trying next cloud model...")
+                                continue
+                            return f"❌ Error: {error_text}"
 
                     try:
                         content = response["choices"][0]["message"]["content"]
@@ -1185,10 +1501,11 @@ class AIAssistant:
         # Prefer models with larger context windows for handoffs
         # Sort by context window size (largest first)
         available_models = []
+        today_usage = self.token_manager.get_today_usage_all()
         
         for model in FREE_MODELS:
             model_id = model['id']
-            requests, tokens = self.token_manager.get_today_usage(model_id)
+            requests, tokens = today_usage.get(model_id, (0, 0))
             
             # Skip if at limit
             if requests >= model['daily_limit']:
@@ -1214,6 +1531,7 @@ class AIAssistant:
     def _get_available_models(self) -> List[str]:
         """Get list of currently available models (not exhausted)"""
         available = []
+        today_usage = self.token_manager.get_today_usage_all()
         
         for model in FREE_MODELS:
             model_id = model['id']
@@ -1223,7 +1541,7 @@ class AIAssistant:
                 continue
             
             # Check usage
-            requests, _ = self.token_manager.get_today_usage(model_id)
+            requests, _ = today_usage.get(model_id, (0, 0))
             if requests < model['daily_limit']:
                 available.append(model_id)
         
@@ -1300,8 +1618,9 @@ class AIAssistant:
         """List available free models"""
         print("\n🤖 Available Free Models:\n")
         
+        today_usage = self.token_manager.get_today_usage_all()
         for i, model in enumerate(FREE_MODELS, 1):
-            requests, tokens = self.token_manager.get_today_usage(model['id'])
+            requests, tokens = today_usage.get(model['id'], (0, 0))
             usage_pct = (requests / model['daily_limit']) * 100
             
             print(f"{i}. {model['name']}")
@@ -1319,11 +1638,7 @@ class AIAssistant:
             return
             
         # Get today's usage
-        today_usage = {}
-        for model in FREE_MODELS:
-            model_id = model['id']
-            requests, tokens = self.token_manager.get_today_usage(model_id)
-            today_usage[model_id] = (requests, tokens)
+        today_usage = self.token_manager.get_today_usage_all()
         
         self.monitor.print_model_rankings(FREE_MODELS, today_usage)
     
@@ -1334,11 +1649,7 @@ class AIAssistant:
             return
             
         # Get today's usage
-        today_usage = {}
-        for model in FREE_MODELS:
-            model_id = model['id']
-            requests, tokens = self.token_manager.get_today_usage(model_id)
-            today_usage[model_id] = (requests, tokens)
+        today_usage = self.token_manager.get_today_usage_all()
         
         print()
         print(self.monitor.get_recommendation(FREE_MODELS, today_usage))
@@ -1420,8 +1731,11 @@ class AIAssistant:
                 
                 # Get AI response
                 print("AI: ", end="", flush=True)
-                response = self.ask(user_input, use_context, provider=active_provider)
-                print(response)
+                response = self.ask(user_input, use_context, provider=active_provider, stream=True)
+                if self.last_response_streamed:
+                    print()
+                else:
+                    print(response)
                 print()
                 
             except KeyboardInterrupt:
@@ -1435,11 +1749,9 @@ class AIAssistant:
                 print("Continuing chat...\n")
 
 
-def main():
-    """Main CLI entry point"""
-    # Run startup initialization (quick mode - no verbose output by default)
-    if STARTUP_INIT_AVAILABLE:
-        quick_init(verbose=False)
+def _build_parser():
+    """Full argparse tree, for help output and anything _fast_args declines"""
+    import argparse
     
     parser = argparse.ArgumentParser(
         description="GitHub CLI AI Assistant with intelligent token management"
@@ -1473,7 +1785,7 @@ def main():
     
     # Stats command
     stats_parser = subparsers.add_parser("stats", help="Show usage statistics")
-    stats_parser.add_argument("--days", type=int, default=7, 
+    stats_parser.add_argument("--days", type=int, default=DEFAULT_STATS_DAYS, 
                              help="Number of days to show (default: 7)")
     
     # Models command
@@ -1497,9 +1809,40 @@ def main():
         default=None,
         help="Delete cache entries older than this many hours (default: 24)",
     )
+    
+    return parser
+
+
+def _fast_args(argv: List[str]) -> Optional[SimpleNamespace]:
+    """Parse the common invocations by hand; None means fall back to argparse"""
+    if not argv:
+        return None
+    command, rest = argv[0], argv[1:]
+    if command in _BARE_COMMANDS and not rest:
+        return SimpleNamespace(command=command)
+    if command == "chat" and not rest:
+        return SimpleNamespace(command=command, no_context=False, provider=None)
+    if command == "stats":
+        if not rest:
+            return SimpleNamespace(command=command, days=DEFAULT_STATS_DAYS)
+        if len(rest) == 2 and rest[0] == "--days" and rest[1].isascii() and rest[1].isdigit():
+            return SimpleNamespace(command=command, days=int(rest[1]))
+        return None
+    if command == "ask" and rest and not any(arg.startswith("-") for arg in rest):
+        return SimpleNamespace(command=command, prompt=rest, no_context=False, provider=None)
+    return None
+
 
+def main():
+    """Main CLI entry point"""
+    # Run startup initialization (quick mode - no verbose output by default)
+    if STARTUP_INIT_AVAILABLE:
+        quick_init(verbose=False)
     
-    args = parser.parse_args()
+    argv = sys.argv[1:]
+    args = _fast_args(argv)
+    if args is None:
+        args = _build_parser().parse_args(argv)
     
     assistant = AIAssistant()
     
@@ -1511,8 +1854,8 @@ def main():
     elif args.command == "ask":
         prompt = " ".join(args.prompt)
         use_context = not args.no_context
-        response = assistant.ask(prompt, use_context, provider=args.provider)
-        print(f"\n{response}\n")
+        response = assistant.ask(prompt, use_context, provider=args.provider, stream=True)
+        print("\n" if assistant.last_response_streamed else f"\n{response}\n")
     elif args.command == "stats":
         assistant.show_stats(args.days)
     elif args.command == "models":
@@ -1561,7 +1904,7 @@ def main():
             print("\n❌ Memory bridge system not available")
             print("   Run: cd gh-ai-assistant && pip install -e .")
     else:
-        parser.print_help()
+        _build_parser().print_help()
 
 
 if __name__ == "__main__":
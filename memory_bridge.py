@@ -159,6 +159,13 @@ class MemoryBridge:
             )
         ''')
         
+        # Pending activations are the only rows looked up by recency
+        cursor.execute('''
+            CREATE INDEX IF NOT EXISTS idx_bridge_pending
+            ON bridge_activations(activation_time DESC)
+            WHERE successful = 0
+        ''')
+        
         # Bridge statistics
         cursor.execute('''
             CREATE TABLE IF NOT EXISTS bridge_stats (
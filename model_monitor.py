@@ -389,11 +389,7 @@ class SmartModelSelector:
             Model ID to use, or None if no models available
         """
         # Get today's usage for all models
-        today_usage = {}
-        for model in self.free_models:
-            model_id = model['id']
-            requests, tokens = self.token_manager.get_today_usage(model_id)
-            today_usage[model_id] = (requests, tokens)
+        today_usage = self.token_manager.get_today_usage_all()
         
         # Get best model excluding recently failed ones
         best = self.monitor.get_best_model(
@@ -429,11 +425,7 @@ class SmartModelSelector:
         """
         Get an ordered sequence of models to try (best to worst)
         """
-        today_usage = {}
-        for model in self.free_models:
-            model_id = model['id']
-            requests, tokens = self.token_manager.get_today_usage(model_id)
-            today_usage[model_id] = (requests, tokens)
+        today_usage = self.token_manager.get_today_usage_all()
         
         ranked = self.monitor.get_ranked_models(self.free_models, today_usage)
         
@@ -463,11 +455,7 @@ def main():
     token_manager = TokenManager()
     
     # Get today's usage
-    today_usage = {}
-    for model in FREE_MODELS:
-        model_id = model['id']
-        requests, tokens = token_manager.get_today_usage(model_id)
-        today_usage[model_id] = (requests, tokens)
+    today_usage = token_manager.get_today_usage_all()
     
     if args.rankings:
         monitor.print_model_rankings(FREE_MODELS, today_usage)
@@ -17,7 +17,7 @@ from typing import Dict, List, Optional
 try:
     from model_refresh import refresh_free_models
     from conversation_store import ConversationStore
-    from api_keys import APIKeyManager, PROVIDERS
+    from api_keys import get_api_key_manager, PROVIDERS
     MODEL_SYSTEMS_AVAILABLE = True
 except ImportError as e:
     MODEL_SYSTEMS_AVAILABLE = False
@@ -159,7 +159,7 @@ class StartupInitializer:
             return False
             
         try:
-            manager = APIKeyManager()
+            manager = get_api_key_manager()
             configured = manager.list_configured_providers()
             
             if configured:
@@ -254,11 +254,7 @@ class MultiNeuronSelector:
             print(explanation)
         
         # Get today's usage
-        today_usage = {}
-        for model in self.free_models:
-            model_id = model['id']
-            requests, tokens = self.token_manager.get_today_usage(model_id)
-            today_usage[model_id] = (requests, tokens)
+        today_usage = self.token_manager.get_today_usage_all()
         
         # If we have preferred models for this task, try them first
         if preferred_models:
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Tests for the collective intelligence store
+"""
+
+import os
+import shutil
+import sqlite3
+import sys
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(__file__))
+import collective_intelligence
+from collective_intelligence import (
+    CollectiveMemory,
+    CollectiveNode,
+    CollectiveState,
+    HiveMind,
+)
+
+
+def _memory(memory_type, index):
+    return CollectiveMemory(
+        timestamp=datetime.now(),
+        memory_type=memory_type,
+        content={"index": index},
+        importance=0.5
+    )
+
+
+class HiveMindTestCase(unittest.TestCase):
+    """Point the collective database at a scratch directory"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        config_dir = Path(self.temp_dir)
+        for name, value in (('CONFIG_DIR', config_dir),
+                            ('COLLECTIVE_DB', config_dir / "collective.db")):
+            patcher = patch.object(collective_intelligence, name, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def count_memories(self, hive):
+        return hive._conn.execute(
+            "SELECT COUNT(*) FROM collective_memory"
+        ).fetchone()[0]
+
+
+class TestAsyncWrites(HiveMindTestCase):
+    """Test the writer-thread path of HiveMind"""
+
+    def test_queued_writes_visible_after_flush(self):
+        """Writes handed to the writer thread are committed by flush()"""
+        hive = HiveMind(async_writes=True)
+        self.addCleanup(hive.close)
+        hive.assimilate_knowledge_bulk(_memory("experience", i) for i in range(3))
+
+        self.assertTrue(hive.flush(timeout=5))
+        self.assertEqual(self.count_memories(hive), 3)
+
+    def test_failed_write_does_not_drop_others(self):
+        """A write that violates a constraint is rolled back alone and reported"""
+        hive = HiveMind(async_writes=True)
+        self.addCleanup(hive.close)
+        with patch('builtins.print'):
+            hive.assimilate_knowledge(_memory("experience", 1))
+            hive.assimilate_knowledge(_memory(None, 2))  # memory_type is NOT NULL
+            hive.assimilate_knowledge(_memory("experience", 3))
+
+            with self.assertRaises(sqlite3.DatabaseError):
+                hive.flush(timeout=5)
+        self.assertEqual(self.count_memories(hive), 2)
+        # Reported once, not again on the next flush
+        self.assertTrue(hive.flush(timeout=5))
+
+    def test_close_drains_queue(self):
+        """close() commits everything still queued"""
+        hive = HiveMind(async_writes=True)
+        hive.assimilate_knowledge_bulk(_memory("experience", i) for i in range(5))
+        hive.close()
+
+        conn = sqlite3.connect(collective_intelligence.COLLECTIVE_DB)
+        try:
+            count = conn.execute("SELECT COUNT(*) FROM collective_memory").fetchone()[0]
+        finally:
+            conn.close()
+        self.assertEqual(count, 5)
+
+    def test_write_after_close_raises(self):
+        """Writing through a closed HiveMind fails with a clear error"""
+        hive = HiveMind(async_writes=True)
+        hive.close()
+
+        with self.assertRaises(sqlite3.ProgrammingError):
+            hive.assimilate_knowledge(_memory("experience", 1))
+
+
+class TestLearning(HiveMindTestCase):
+    """Test pattern and strategy learning"""
+
+    def setUp(self):
+        super().setUp()
+        self.hive = HiveMind()
+        self.addCleanup(self.hive.close)
+        printer = patch('builtins.print')
+        printer.start()
+        self.addCleanup(printer.stop)
+
+    def test_learn_pattern_reinforces_existing(self):
+        """Learning the same pattern again raises confidence and validation count"""
+        self.hive.learn_pattern("routing", {"model": "a", "ok": True}, confidence=0.5)
+        self.hive.learn_pattern("routing", {"ok": True, "model": "a"}, confidence=0.5)
+
+        patterns = list(self.hive.get_learned_patterns("routing", min_confidence=0.0))
+        self.assertEqual(len(patterns), 1)
+        self.assertAlmostEqual(patterns[0]["confidence"], 0.6)
+        self.assertEqual(patterns[0]["validations"], 1)
+
+    def test_bulk_outcomes_match_sequential_reports(self):
+        """report_strategy_outcomes_bulk leaves the same rows as one call per outcome"""
+        strategies = {"rate_limit": {"actions": ["wait"]},
+                      "slow_response": {"actions": ["cache"]}}
+        outcomes = [
+            ("rate_limit", strategies["rate_limit"], True, 2.0),
+            ("rate_limit", strategies["rate_limit"], False, 4.0),
+            ("rate_limit", strategies["rate_limit"], True, 2.0),
+            ("slow_response", strategies["slow_response"], False, 1.5),
+        ]
+        sequential = self.hive
+        bulk_path = Path(self.temp_dir) / "bulk.db"
+        with patch.object(collective_intelligence, 'COLLECTIVE_DB', bulk_path):
+            bulk = HiveMind()
+        self.addCleanup(bulk.close)
+
+        for hive in (sequential, bulk):
+            hive._write(collective_intelligence._SQL_UPSERT_STRATEGY, [
+                (challenge_type,) + collective_intelligence._canonical_json(strategy)
+                for challenge_type, strategy in strategies.items()
+            ])
+        for outcome in outcomes:
+            sequential.report_strategy_outcome(*outcome)
+        self.assertEqual(bulk.report_strategy_outcomes_bulk(outcomes), len(outcomes))
+
+        for query in (
+            "SELECT challenge_type, strategy, times_used, success_rate, avg_resolution_time"
+            " FROM overcome_strategies ORDER BY challenge_type",
+            "SELECT pattern_type, pattern_data, times_validated, confidence"
+            " FROM learned_patterns ORDER BY pattern_type, pattern_data",
+        ):
+            expected = sequential._conn.execute(query).fetchall()
+            actual = bulk._conn.execute(query).fetchall()
+            self.assertEqual(len(actual), len(expected))
+            for got, want in zip(actual, expected):
+                self.assertEqual(got[:3], want[:3])
+                for got_value, want_value in zip(got[3:], want[3:]):
+                    self.assertAlmostEqual(got_value, want_value)
+
+
+class TestAssimilation(HiveMindTestCase):
+    """Test batched node and memory assimilation"""
+
+    def setUp(self):
+        super().setUp()
+        self.hive = HiveMind()
+        self.addCleanup(self.hive.close)
+
+    def test_assimilate_nodes(self):
+        """Every node is registered in memory and persisted in one write"""
+        nodes = [
+            CollectiveNode(node_id=f"model-{i}", node_type="cloud_model",
+                           capabilities=["code"], current_load=0.0,
+                           performance_score=60.0 + i, last_heartbeat=1.0,
+                           state=CollectiveState.OPTIMAL, knowledge_domains={"python"})
+            for i in range(3)
+        ]
+        with patch('builtins.print'):
+            self.hive.assimilate_nodes(nodes)
+
+        self.assertEqual(set(self.hive.active_nodes), {"model-0", "model-1", "model-2"})
+        rows = self.hive._conn.execute(
+            "SELECT node_id, performance_score, capabilities FROM nodes ORDER BY node_id"
+        ).fetchall()
+        self.assertEqual(rows, [(f"model-{i}", 60.0 + i, '["code"]') for i in range(3)])
+
+    def test_assimilate_knowledge_bulk(self):
+        """Bulk memories are stored in order and kept in the recent window"""
+        memories = [_memory("experience", i) for i in range(4)]
+        self.hive.assimilate_knowledge_bulk(memories)
+
+        self.assertEqual(self.hive.recent_memory(), memories)
+        rows = self.hive._conn.execute(
+            "SELECT content FROM collective_memory ORDER BY id"
+        ).fetchall()
+        self.assertEqual([collective_intelligence._loads(row[0]) for row in rows],
+                         [{"index": i} for i in range(4)])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Tests for the context integrity data types
+"""
+
+import copy
+import os
+import pickle
+import sys
+import unittest
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(__file__))
+from context_integrity import ContextElement, ContextPriority, ContextSnapshot
+
+
+class TestContextElement(unittest.TestCase):
+    """Test ContextElement and ContextSnapshot value semantics"""
+
+    def setUp(self):
+        self.element = ContextElement(
+            content='ANCHORS: keep this',
+            priority=ContextPriority.CRITICAL,
+            timestamp_ns=1_700_000_000_000_000_000,
+            element_type='fact',
+            token_count=3,
+            hash='abc123'
+        )
+
+    def test_copy_and_pickle_round_trip(self):
+        """Frozen, slotted elements survive copy, deepcopy and pickle"""
+        for clone in (copy.copy, copy.deepcopy, lambda e: pickle.loads(pickle.dumps(e))):
+            restored = clone(self.element)
+            self.assertEqual(restored, self.element)
+            self.assertEqual(restored.timestamp, self.element.timestamp)
+
+    def test_snapshot_deepcopy_and_pickle(self):
+        """Snapshots holding elements keep their derived fields"""
+        snapshot = ContextSnapshot(
+            snapshot_id='snap',
+            timestamp=datetime(2024, 1, 1),
+            elements=[self.element],
+            total_tokens=3,
+            checksum='c',
+            metadata={}
+        )
+        for clone in (copy.deepcopy, lambda s: pickle.loads(pickle.dumps(s))):
+            restored = clone(snapshot)
+            self.assertEqual(restored.elements, snapshot.elements)
+            self.assertEqual(restored.critical_hashes, frozenset({'abc123'}))
+            self.assertTrue(restored.has_anchors)
+
+
+if __name__ == "__main__":
+    unittest.main()
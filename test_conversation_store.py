@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Tests for the conversation store
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from datetime import datetime
+from pathlib import Path
+from unittest.mock import patch
+
+sys.path.insert(0, os.path.dirname(__file__))
+import conversation_store
+from conversation_store import ConversationStore, Message
+
+
+class TestAddMessagesReturning(unittest.TestCase):
+    """Test batch inserts that hand back message ids"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.store = ConversationStore(Path(self.temp_dir) / "conversations.db")
+        self.messages = [
+            Message(role="user" if i % 2 else "assistant", content=f"message {i}",
+                    timestamp=datetime.now(), tokens_used=1)
+            for i in range(400)
+        ]
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def assert_ids_in_message_order(self, ids):
+        self.assertEqual(len(ids), len(self.messages))
+        rows = dict(self.store._connect().execute("SELECT id, content FROM messages"))
+        self.assertEqual([rows[i] for i in ids], [m.content for m in self.messages])
+        info = self.store.get_session_info("s1")
+        self.assertEqual(info.message_count, 400)
+        self.assertEqual(info.total_tokens, 400)
+
+    @unittest.skipUnless(conversation_store.SQLITE_HAS_RETURNING,
+                         "SQLite older than 3.35 has no RETURNING")
+    def test_ids_across_chunk_boundaries(self):
+        """Ids come back in message order when the batch spans several chunks"""
+        with patch.object(conversation_store, 'INSERT_CHUNK_ROWS', 166):
+            ids = self.store.add_messages_returning("s1", self.messages)
+
+        self.assert_ids_in_message_order(ids)
+
+    def test_ids_without_returning(self):
+        """Older SQLite builds fall back to one insert per message"""
+        with patch.object(conversation_store, 'SQLITE_HAS_RETURNING', False):
+            ids = self.store.add_messages_returning("s1", self.messages)
+
+        self.assert_ids_in_message_order(ids)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -3,14 +3,18 @@
 Test suite for GitHub CLI AI Assistant
 """
 
+import io
 import unittest
 import os
+import shutil
 import sqlite3
 import tempfile
 from pathlib import Path
 from unittest.mock import patch, MagicMock
 from datetime import datetime
-from contextlib import nullcontext
+from contextlib import nullcontext, redirect_stdout
+
+import requests
 
 # Import from gh_ai_core
 import sys
@@ -20,6 +24,11 @@ from gh_ai_core import (
     OpenRouterClient,
     AIAssistant,
     GitHubContextExtractor,
+    FREE_MODELS,
+    RATE_LIMIT_RETRIES,
+    TokenBucket,
+    _build_parser,
+    _fast_args,
     keyring as core_keyring,
 )
 
@@ -89,6 +98,60 @@ class TestTokenManager(unittest.TestCase):
         self.assertEqual(requests, 2)
         self.assertEqual(tokens, 300)
 
+    def test_record_usage_many(self):
+        """Test batch recording updates the log and today's totals"""
+        manager = TokenManager()
+        manager.db_path = self.db_path
+        manager._init_database()
+
+        manager.record_usage_many([
+            ("model-a", 100, 0.0),
+            ("model-a", 50, 0.0),
+            ("model-b", 10, 0.0),
+        ])
+
+        usage = manager.get_today_usage_all()
+        self.assertEqual(usage["model-a"], (2, 150))
+        self.assertEqual(usage["model-b"], (1, 10))
+        self.assertEqual(manager.get_usage_stats(1)["model-a"]["requests"], 2)
+
+    def test_backfill_daily_totals(self):
+        """Usage logged before the daily rollup existed is folded into it once"""
+        conn = sqlite3.connect(self.db_path)
+        conn.execute('''
+            CREATE TABLE usage (
+                id INTEGER PRIMARY KEY AUTOINCREMENT,
+                model TEXT NOT NULL,
+                timestamp DATETIME DEFAULT CURRENT_TIMESTAMP,
+                tokens_used INTEGER NOT NULL,
+                request_count INTEGER DEFAULT 1,
+                cost REAL DEFAULT 0.0
+            )
+        ''')
+        conn.executemany(
+            "INSERT INTO usage (model, timestamp, tokens_used, cost) VALUES (?, ?, ?, ?)",
+            [("model-a", "2024-01-01 09:00:00", 100, 0.5),
+             ("model-a", "2024-01-01 18:00:00", 50, 0.25),
+             ("model-a", "2024-01-02 09:00:00", 10, 0.0),
+             ("model-b", "2024-01-01 12:00:00", 7, 0.0)]
+        )
+        conn.commit()
+        conn.close()
+
+        manager = TokenManager()
+        manager.db_path = self.db_path
+        manager._init_database()
+        manager._init_database()  # a second start must not count rows twice
+
+        rows = manager._connect().execute(
+            "SELECT model, day, requests, tokens, cost FROM usage_daily ORDER BY model, day"
+        ).fetchall()
+        self.assertEqual(rows, [
+            ("model-a", "2024-01-01", 2, 150, 0.75),
+            ("model-a", "2024-01-02", 1, 10, 0.0),
+            ("model-b", "2024-01-01", 1, 7, 0.0),
+        ])
+
 
 class TestOpenRouterClient(unittest.TestCase):
     """Test OpenRouter client"""
@@ -101,7 +164,7 @@ class TestOpenRouterClient(unittest.TestCase):
         self.assertIn("Authorization", client.headers)
         self.assertIn("Bearer test-api-key", client.headers["Authorization"])
         
-    @patch('requests.post')
+    @patch('requests.Session.post')
     def test_chat_completion_success(self, mock_post):
         """Test successful chat completion"""
         mock_response = MagicMock()
@@ -120,6 +183,94 @@ class TestOpenRouterClient(unittest.TestCase):
         self.assertIn("choices", result)
         self.assertEqual(result["choices"][0]["message"]["content"], "Test response")
 
+    @patch('time.sleep')
+    @patch('requests.Session.post')
+    def test_rate_limit_retries(self, mock_post, mock_sleep):
+        """429s are retried RATE_LIMIT_RETRIES times, releasing each streamed response"""
+        responses = []
+
+        def fake_post(*args, **kwargs):
+            response = MagicMock(status_code=429, headers={"Retry-After": "2"})
+            response.raise_for_status.side_effect = requests.exceptions.HTTPError("429")
+            response.json.return_value = {}
+            responses.append(response)
+            return response
+
+        mock_post.side_effect = fake_post
+        client = OpenRouterClient("test-api-key")
+        result = client.chat_completion(
+            "test-model", [{"role": "user", "content": "Hello"}], stream=True
+        )
+
+        self.assertEqual(result["error"], "rate_limit")
+        self.assertEqual(mock_post.call_count, RATE_LIMIT_RETRIES + 1)
+        self.assertEqual(mock_sleep.call_count, RATE_LIMIT_RETRIES)
+        mock_sleep.assert_called_with(2.0)
+        for response in responses[:-1]:
+            response.close.assert_called_once_with()
+
+    def test_retry_delay(self):
+        """Retry-After is honoured up to the cap; otherwise jittered backoff"""
+        def delay(attempt, retry_after=None):
+            headers = {"Retry-After": retry_after} if retry_after else {}
+            return OpenRouterClient._retry_delay(MagicMock(headers=headers), attempt)
+
+        self.assertEqual(delay(0, "3"), 3.0)
+        self.assertIsNone(delay(0, "30"))
+        self.assertIsNone(delay(0, "Wed, 21 Oct 2015 07:28:00 GMT"))
+        with patch('random.uniform', return_value=1.5):
+            self.assertEqual(delay(0), 1.5)
+            self.assertEqual(delay(2), 6.0)
+            self.assertIsNone(delay(3))
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Test per-model request pacing"""
+
+    @patch('time.sleep')
+    @patch('time.monotonic')
+    def test_acquire_paces_after_burst(self, mock_monotonic, mock_sleep):
+        """A full bucket allows a burst, then callers wait for the refill"""
+        mock_monotonic.return_value = 100.0
+        bucket = TokenBucket(rate=1.0, capacity=2)
+
+        self.assertEqual(bucket.acquire(), 0.0)
+        self.assertEqual(bucket.acquire(), 0.0)
+        self.assertEqual(bucket.acquire(), 1.0)
+        mock_sleep.assert_called_once_with(1.0)
+
+        # The previous caller holds the slot until t=101, so the next is at t=102
+        mock_monotonic.return_value = 100.5
+        self.assertEqual(bucket.acquire(), 1.5)
+
+        # Idle time refills the bucket, but never beyond its capacity
+        mock_monotonic.return_value = 200.0
+        self.assertEqual(bucket.acquire(), 0.0)
+        self.assertEqual(bucket.acquire(), 0.0)
+        self.assertEqual(bucket.acquire(), 1.0)
+
+
+class TestFastArgs(unittest.TestCase):
+    """Test the argparse-free dispatch of common subcommands"""
+
+    def test_accepted_invocations_match_argparse(self):
+        """Hand-parsed commands produce the same namespace argparse would"""
+        for argv in (["models"], ["chat"], ["stats"], ["stats", "--days", "3"],
+                     ["ask", "how", "do", "I", "rebase?"]):
+            with self.subTest(argv=argv):
+                fast = _fast_args(argv)
+                self.assertIsNotNone(fast)
+                self.assertEqual(vars(fast), vars(_build_parser().parse_args(argv)))
+
+    def test_declined_invocations(self):
+        """Anything unusual falls back to argparse"""
+        for argv in ([], ["models", "--json"], ["stats", "--days", "٣"],
+                     ["stats", "--days", "²"], ["stats", "--days"], ["ask"],
+                     ["ask", "-x"], ["ask", "hello", "--provider", "zai-glm"],
+                     ["unknown"]):
+            with self.subTest(argv=argv):
+                self.assertIsNone(_fast_args(argv))
+
 
 class TestGitHubContextExtractor(unittest.TestCase):
     """Test GitHub context extraction"""
@@ -204,6 +355,114 @@ class TestAIAssistant(unittest.TestCase):
         os.environ.pop('GH_AI_PROVIDER', None)
         os.environ.pop('ZAI_API_KEY', None)
 
+    @patch.dict(os.environ, {'GH_AI_PROVIDER': 'openrouter'})
+    @patch('gh_ai_core.MEMORY_TRANSFER_AVAILABLE', False)
+    @patch.object(AIAssistant, '_ensure_token_recycler', return_value=None)
+    @patch('requests.Session.post')
+    def test_stream_failing_partway_is_not_reported_as_streamed(self, mock_post, _recycler):
+        """A stream that drops mid-reply must leave the final answer for the caller to print."""
+        if core_keyring is None:
+            self.skipTest("keyring module not available")
+
+        def dropped_lines():
+            yield b'data: {"choices":[{"delta":{"content":"Hel"}}]}'
+            raise requests.exceptions.ChunkedEncodingError("conn dropped")
+
+        def fake_post(*args, **kwargs):
+            response = MagicMock()
+            response.iter_lines.side_effect = lambda: dropped_lines()
+            response.__exit__.return_value = False
+            return response
+
+        mock_post.side_effect = fake_post
+        assistant = self._openrouter_assistant()
+
+        out = io.StringIO()
+        with patch.object(assistant.token_manager, 'get_today_usage_all', return_value={}), \
+                redirect_stdout(out):
+            output = assistant.ask('Hello', use_context=False, provider='openrouter', stream=True)
+
+        self.assertEqual(output, '❌ Error: conn dropped')
+        self.assertFalse(assistant.last_response_streamed)
+        self.assertIn('Hel\n⚠️', out.getvalue())
+
+    @patch.dict(os.environ, {'GH_AI_PROVIDER': 'openrouter'})
+    @patch('gh_ai_core.MEMORY_TRANSFER_AVAILABLE', False)
+    def test_saved_key_rescans_configured_providers(self):
+        """Saving a key through the assistant makes the provider listing rescan the keyring."""
+        if core_keyring is None:
+            self.skipTest("keyring module not available")
+        import api_keys
+
+        temp_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, temp_dir, ignore_errors=True)
+        manifest = Path(temp_dir) / "configured.json"
+        manifest.write_text('["groq"]')
+        stored = {}
+
+        def get_password(service, username):
+            return stored.get(username)
+
+        def set_password(service, username, password):
+            stored[username] = password
+
+        with patch.object(api_keys, 'CONFIGURED_MANIFEST', manifest), \
+                patch('keyring.get_password', side_effect=get_password), \
+                patch('keyring.set_password', side_effect=set_password):
+            self.assertEqual(api_keys.APIKeyManager().list_configured_providers(), ["groq"])
+            assistant = AIAssistant()
+            assistant._save_api_key("sk-or-test-key")
+
+            self.assertEqual(api_keys.APIKeyManager().list_configured_providers(), ["openrouter"])
+
+    def _openrouter_assistant(self):
+        """Assistant that walks FREE_MODELS in order with no local fallback"""
+        with patch('gh_ai_core.keyring.get_password', return_value="test-api-key"):
+            assistant = AIAssistant()
+        assistant.model_selector = None
+        assistant.use_ollama_fallback = False
+        return assistant
+
+    def _ask_with_http_status(self, mock_post, status_code):
+        """Ask once while every POST fails with the given HTTP status"""
+        def fake_post(*args, **kwargs):
+            response = MagicMock(status_code=status_code)
+            response.raise_for_status.side_effect = requests.exceptions.HTTPError(
+                f"{status_code} error"
+            )
+            return response
+
+        mock_post.side_effect = fake_post
+        assistant = self._openrouter_assistant()
+        with patch.object(assistant.token_manager, 'get_today_usage_all', return_value={}), \
+                redirect_stdout(io.StringIO()):
+            return assistant.ask('Hello', use_context=False, provider='openrouter')
+
+    @patch.dict(os.environ, {'GH_AI_PROVIDER': 'openrouter'})
+    @patch('gh_ai_core.MEMORY_TRANSFER_AVAILABLE', False)
+    @patch.object(AIAssistant, '_ensure_token_recycler', return_value=None)
+    @patch('requests.Session.post')
+    def test_client_error_does_not_fail_over(self, mock_post, _recycler):
+        """A 401 fails the same way on every model, so only one request is sent."""
+        if core_keyring is None:
+            self.skipTest("keyring module not available")
+        output = self._ask_with_http_status(mock_post, 401)
+
+        self.assertEqual(output, '❌ Error: 401 error')
+        self.assertEqual(mock_post.call_count, 1)
+
+    @patch.dict(os.environ, {'GH_AI_PROVIDER': 'openrouter'})
+    @patch('gh_ai_core.MEMORY_TRANSFER_AVAILABLE', False)
+    @patch.object(AIAssistant, '_ensure_token_recycler', return_value=None)
+    @patch('requests.Session.post')
+    def test_server_error_fails_over(self, mock_post, _recycler):
+        """A 503 may be specific to one model, so every model is tried."""
+        if core_keyring is None:
+            self.skipTest("keyring module not available")
+        output = self._ask_with_http_status(mock_post, 503)
+
+        self.assertEqual(output, '❌ Error: 503 error')
+        self.assertEqual(mock_post.call_count, len(FREE_MODELS))
 
 
 def run_tests():
@@ -97,16 +97,18 @@ class TokenCache:
         conn.commit()
         conn.close()
         
-    def _hash_prompt(self, prompt: str, model: str) -> str:
-        """Create semantic hash of prompt"""
+    def _hash_prompt(self, prompt: str, model: str, scope: Optional[str] = None) -> str:
+        """Create semantic hash of prompt, optionally narrowed to a request scope"""
         # Normalize prompt (remove extra whitespace, lowercase for semantic matching)
         normalized = ' '.join(prompt.lower().split())
         content = f"{model}:{normalized}"
+        if scope:
+            content = f"{content}:{scope}"
         return hashlib.sha256(content.encode()).hexdigest()
         
-    def get(self, prompt: str, model: str) -> Optional[CachedResponse]:
+    def get(self, prompt: str, model: str, scope: Optional[str] = None) -> Optional[CachedResponse]:
         """Retrieve cached response"""
-        prompt_hash = self._hash_prompt(prompt, model)
+        prompt_hash = self._hash_prompt(prompt, model, scope)
         
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
@@ -143,9 +145,10 @@ class TokenCache:
         conn.close()
         return None
         
-    def set(self, prompt: str, model: str, response: str, tokens: int):
+    def set(self, prompt: str, model: str, response: str, tokens: int,
+            scope: Optional[str] = None):
         """Cache a response"""
-        prompt_hash = self._hash_prompt(prompt, model)
+        prompt_hash = self._hash_prompt(prompt, model, scope)
         
         conn = sqlite3.connect(self.db_path)
         cursor = conn.cursor()
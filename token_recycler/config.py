@@ -18,6 +18,9 @@ TOKEN_METRICS_DB = CONFIG_DIR / "token_metrics.db"
 DEFAULT_MAX_CACHE_AGE_HOURS = 24
 DEFAULT_MAX_WORKERS = 10
 
+# Bump to orphan every cached completion when the request format changes
+CACHE_KEY_VERSION = 1
+
 
 def ensure_config_dir() -> None:
     """Create the config directory if it does not already exist."""
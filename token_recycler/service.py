@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+import hashlib
+import json
 import time
 import sqlite3
 from dataclasses import dataclass
@@ -16,11 +18,14 @@ from token_optimizer import (  # Reuse existing cache/metrics building blocks
     TokenMetrics,
     TokenMetricsTracker,
 )
-from token_recycler.config import DEFAULT_MAX_CACHE_AGE_HOURS
+from token_recycler.config import CACHE_KEY_VERSION, DEFAULT_MAX_CACHE_AGE_HOURS
 
 if TYPE_CHECKING:  # Avoid runtime import cycle
     from gh_ai_core import TokenManager
 
+# api_kwargs that change how a completion is delivered, not what it says
+_DELIVERY_KWARGS = frozenset({"stream", "on_delta"})
+
 
 @dataclass
 class TokenRecyclerResult:
@@ -80,8 +85,15 @@ class TokenRecyclerService:
         prompt_tokens = self.tokenizer.count_tokens(prompt, model)
         cache_entry: Optional[CachedResponse] = None
 
+        kwargs = dict(api_kwargs or {})
+        if max_tokens is not None:
+            kwargs.setdefault("max_tokens", max_tokens)
+        elif self.default_max_tokens is not None:
+            kwargs.setdefault("max_tokens", self.default_max_tokens)
+
+        cache_scope = self._cache_scope(messages, kwargs) if use_cache else None
         if use_cache:
-            cache_entry = self.cache.get(prompt, model)
+            cache_entry = self.cache.get(prompt, model, scope=cache_scope)
 
         if cache_entry:
             latency_ms = (time.perf_counter() - started) * 1000
@@ -105,12 +117,6 @@ class TokenRecyclerService:
             )
 
         latency_start = time.perf_counter()
-        kwargs = dict(api_kwargs or {})
-        if max_tokens is not None:
-            kwargs.setdefault("max_tokens", max_tokens)
-        elif self.default_max_tokens is not None:
-            kwargs.setdefault("max_tokens", self.default_max_tokens)
-
         response = self.api_call(model, messages, **kwargs)
         latency_ms = (time.perf_counter() - latency_start) * 1000
 
@@ -163,7 +169,7 @@ class TokenRecyclerService:
 
         self.metrics.record(metrics)
         if use_cache:
-            self.cache.set(prompt, model, content, completion_tokens)
+            self.cache.set(prompt, model, content, completion_tokens, scope=cache_scope)
         if self.token_manager and total_tokens is not None:
             self.token_manager.record_usage(model, total_tokens, cost)
 
@@ -175,6 +181,21 @@ class TokenRecyclerService:
             latency_ms=latency_ms,
         )
 
+    @staticmethod
+    def _cache_scope(messages: List[Dict[str, Any]], api_kwargs: Dict[str, Any]) -> str:
+        """Digest of the full request so cached answers never cross contexts.
+
+        The messages carry the repository context (recent commits, diff stat),
+        so a new commit or edit yields a new scope and misses the cache.
+        """
+        kwargs = {k: v for k, v in api_kwargs.items() if k not in _DELIVERY_KWARGS}
+        payload = json.dumps(
+            {"version": CACHE_KEY_VERSION, "messages": messages, "kwargs": kwargs},
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(payload.encode()).hexdigest()
+
     def cleanup(self, max_age_hours: Optional[int] = None) -> Dict[str, Any]:
         """Clean expired cache rows, vacuum databases, and return summary."""
 